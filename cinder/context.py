@@ -192,6 +192,8 @@ class RequestContext(context.RequestContext):
 
     def elevated(self, read_deleted=None, overwrite=False):
         """Return a version of this context with admin flag set."""
+        # Callers are free to mutate the returned context (e.g. set
+        # read_deleted), so each call must hand out a fresh copy.
         context = self.deepcopy()
         context.is_admin = True
 
@@ -1130,6 +1130,13 @@ def quota_reserve(context, resources, quotas, deltas, expire,
                               is_allocated_reserve=is_allocated_reserve)
 
 
+def quota_reserve_multi(context, resources, per_project, expire,
+                        until_refresh, max_age):
+    """Check quotas and create reservations for several projects at once."""
+    return IMPL.quota_reserve_multi(context, resources, per_project, expire,
+                                    until_refresh, max_age)
+
+
 def reservation_commit(context, reservations, project_id=None):
     """Commit quota reservations."""
     return IMPL.reservation_commit(context, reservations,
@@ -1238,14 +1245,20 @@ def transfer_get(context, transfer_id):
     return IMPL.transfer_get(context, transfer_id)
 
 
-def transfer_get_all(context):
+def transfer_get_with_volume(context, transfer_id):
+    """Get a volume transfer record and its volume in a single query."""
+    return IMPL.transfer_get_with_volume(context, transfer_id)
+
+
+def transfer_get_all(context, filters=None):
     """Get all volume transfer records."""
-    return IMPL.transfer_get_all(context)
+    return IMPL.transfer_get_all(context, filters=filters)
 
 
-def transfer_get_all_by_project(context, project_id):
+def transfer_get_all_by_project(context, project_id, filters=None):
     """Get all volume transfer records for specified project."""
-    return IMPL.transfer_get_all_by_project(context, project_id)
+    return IMPL.transfer_get_all_by_project(context, project_id,
+                                            filters=filters)
 
 
 def transfer_create(context, values):
@@ -1144,158 +1144,175 @@ def quota_usage_update_resource(context, old_res, new_res):
             usage.until_refresh = 1
 
 
+def _quota_reserve(context, session, resources, quotas, deltas, expire,
+                   until_refresh, max_age, project_id,
+                   is_allocated_reserve):
+    """Create reservations for one project inside the caller's session.
+
+    Returns a (reservations, unders, overs, usages, allocated) tuple;
+    interpreting unders/overs (warning vs. raising OverQuota) is left to
+    the caller so that several projects can share one transaction.
+    """
+    elevated = context.elevated()
+    if project_id is None:
+        project_id = context.project_id
+
+    # Get the current usages
+    usages = _get_quota_usages(context, session, project_id,
+                               resources=deltas.keys())
+    allocated = quota_allocated_get_all_by_project(context, project_id,
+                                                   session=session)
+    allocated.pop('project_id')
+
+    # Handle usage refresh
+    work = set(deltas.keys())
+    while work:
+        resource = work.pop()
+
+        # Do we need to refresh the usage?
+        refresh = False
+        if resource not in usages:
+            usages[resource] = _quota_usage_create(elevated,
+                                                   project_id,
+                                                   resource,
+                                                   0, 0,
+                                                   until_refresh or None,
+                                                   session=session)
+            refresh = True
+        elif usages[resource].in_use < 0:
+            # Negative in_use count indicates a desync, so try to
+            # heal from that...
+            refresh = True
+        elif usages[resource].until_refresh is not None:
+            usages[resource].until_refresh -= 1
+            if usages[resource].until_refresh <= 0:
+                refresh = True
+        elif max_age and usages[resource].updated_at is not None and (
+            (timeutils.utcnow() -
+                usages[resource].updated_at).total_seconds() >= max_age):
+            refresh = True
+
+        # OK, refresh the usage
+        if refresh:
+            # Grab the sync routine
+            sync = QUOTA_SYNC_FUNCTIONS[resources[resource].sync]
+            volume_type_id = getattr(resources[resource],
+                                     'volume_type_id', None)
+            volume_type_name = getattr(resources[resource],
+                                       'volume_type_name', None)
+            updates = sync(elevated, project_id,
+                           volume_type_id=volume_type_id,
+                           volume_type_name=volume_type_name,
+                           session=session)
+            for res, in_use in updates.items():
+                # Make sure we have a destination for the usage!
+                if res not in usages:
+                    usages[res] = _quota_usage_create(
+                        elevated,
+                        project_id,
+                        res,
+                        0, 0,
+                        until_refresh or None,
+                        session=session
+                    )
+
+                # Update the usage
+                usages[res].in_use = in_use
+                usages[res].until_refresh = until_refresh or None
+
+                # Because more than one resource may be refreshed
+                # by the call to the sync routine, and we don't
+                # want to double-sync, we make sure all refreshed
+                # resources are dropped from the work set.
+                work.discard(res)
+
+                # NOTE(Vek): We make the assumption that the sync
+                #            routine actually refreshes the
+                #            resources that it is the sync routine
+                #            for.  We don't check, because this is
+                #            a best-effort mechanism.
+
+    # Check for deltas that would go negative
+    if is_allocated_reserve:
+        unders = [r for r, delta in deltas.items()
+                  if delta < 0 and delta + allocated.get(r, 0) < 0]
+    else:
+        unders = [r for r, delta in deltas.items()
+                  if delta < 0 and delta + usages[r].in_use < 0]
+
+    # TODO(mc_nair): Should ignore/zero alloc if using non-nested driver
+
+    # Now, let's check the quotas
+    # NOTE(Vek): We're only concerned about positive increments.
+    #            If a project has gone over quota, we want them to
+    #            be able to reduce their usage without any
+    #            problems.
+    overs = [r for r, delta in deltas.items()
+             if quotas[r] >= 0 and delta >= 0 and
+             quotas[r] < delta + usages[r].total + allocated.get(r, 0)]
+
+    # NOTE(Vek): The quota check needs to be in the transaction,
+    #            but the transaction doesn't fail just because
+    #            we're over quota, so the OverQuota raise is
+    #            outside the transaction.  If we did the raise
+    #            here, our usage updates would be discarded, but
+    #            they're not invalidated by being over-quota.
+
+    # Create the reservations
+    reservations = []
+    if not overs:
+        for resource, delta in deltas.items():
+            usage = usages[resource]
+            allocated_id = None
+            if is_allocated_reserve:
+                try:
+                    quota = _quota_get(context, project_id, resource,
+                                       session=session)
+                except exception.ProjectQuotaNotFound:
+                    # If we were using the default quota, create DB entry
+                    quota = quota_create(context, project_id, resource,
+                                         quotas[resource], 0)
+                # Since there's no reserved/total for allocated, update
+                # allocated immediately and subtract on rollback if needed
+                quota_allocated_update(context, project_id, resource,
+                                       quota.allocated + delta)
+                allocated_id = quota.id
+                usage = None
+            reservation = _reservation_create(
+                elevated, str(uuid.uuid4()), usage, project_id, resource,
+                delta, expire, session=session, allocated_id=allocated_id)
+
+            reservations.append(reservation.uuid)
+
+            # Also update the reserved quantity
+            # NOTE(Vek): Again, we are only concerned here about
+            #            positive increments.  Here, though, we're
+            #            worried about the following scenario:
+            #
+            #            1) User initiates resize down.
+            #            2) User allocates a new instance.
+            #            3) Resize down fails or is reverted.
+            #            4) User is now over quota.
+            #
+            #            To prevent this, we only update the
+            #            reserved value if the delta is positive.
+            if delta > 0 and not is_allocated_reserve:
+                usages[resource].reserved += delta
+
+    return reservations, unders, overs, usages, allocated
+
+
 @require_context
 @_retry_on_deadlock
 def quota_reserve(context, resources, quotas, deltas, expire,
                   until_refresh, max_age, project_id=None,
                   is_allocated_reserve=False):
-    elevated = context.elevated()
     session = get_session()
     with session.begin():
-        if project_id is None:
-            project_id = context.project_id
-
-        # Get the current usages
-        usages = _get_quota_usages(context, session, project_id,
-                                   resources=deltas.keys())
-        allocated = quota_allocated_get_all_by_project(context, project_id,
-                                                       session=session)
-        allocated.pop('project_id')
-
-        # Handle usage refresh
-        work = set(deltas.keys())
-        while work:
-            resource = work.pop()
-
-            # Do we need to refresh the usage?
-            refresh = False
-            if resource not in usages:
-                usages[resource] = _quota_usage_create(elevated,
-                                                       project_id,
-                                                       resource,
-                                                       0, 0,
-                                                       until_refresh or None,
-                                                       session=session)
-                refresh = True
-            elif usages[resource].in_use < 0:
-                # Negative in_use count indicates a desync, so try to
-                # heal from that...
-                refresh = True
-            elif usages[resource].until_refresh is not None:
-                usages[resource].until_refresh -= 1
-                if usages[resource].until_refresh <= 0:
-                    refresh = True
-            elif max_age and usages[resource].updated_at is not None and (
-                (timeutils.utcnow() -
-                    usages[resource].updated_at).total_seconds() >= max_age):
-                refresh = True
-
-            # OK, refresh the usage
-            if refresh:
-                # Grab the sync routine
-                sync = QUOTA_SYNC_FUNCTIONS[resources[resource].sync]
-                volume_type_id = getattr(resources[resource],
-                                         'volume_type_id', None)
-                volume_type_name = getattr(resources[resource],
-                                           'volume_type_name', None)
-                updates = sync(elevated, project_id,
-                               volume_type_id=volume_type_id,
-                               volume_type_name=volume_type_name,
-                               session=session)
-                for res, in_use in updates.items():
-                    # Make sure we have a destination for the usage!
-                    if res not in usages:
-                        usages[res] = _quota_usage_create(
-                            elevated,
-                            project_id,
-                            res,
-                            0, 0,
-                            until_refresh or None,
-                            session=session
-                        )
-
-                    # Update the usage
-                    usages[res].in_use = in_use
-                    usages[res].until_refresh = until_refresh or None
-
-                    # Because more than one resource may be refreshed
-                    # by the call to the sync routine, and we don't
-                    # want to double-sync, we make sure all refreshed
-                    # resources are dropped from the work set.
-                    work.discard(res)
-
-                    # NOTE(Vek): We make the assumption that the sync
-                    #            routine actually refreshes the
-                    #            resources that it is the sync routine
-                    #            for.  We don't check, because this is
-                    #            a best-effort mechanism.
-
-        # Check for deltas that would go negative
-        if is_allocated_reserve:
-            unders = [r for r, delta in deltas.items()
-                      if delta < 0 and delta + allocated.get(r, 0) < 0]
-        else:
-            unders = [r for r, delta in deltas.items()
-                      if delta < 0 and delta + usages[r].in_use < 0]
-
-        # TODO(mc_nair): Should ignore/zero alloc if using non-nested driver
-
-        # Now, let's check the quotas
-        # NOTE(Vek): We're only concerned about positive increments.
-        #            If a project has gone over quota, we want them to
-        #            be able to reduce their usage without any
-        #            problems.
-        overs = [r for r, delta in deltas.items()
-                 if quotas[r] >= 0 and delta >= 0 and
-                 quotas[r] < delta + usages[r].total + allocated.get(r, 0)]
-
-        # NOTE(Vek): The quota check needs to be in the transaction,
-        #            but the transaction doesn't fail just because
-        #            we're over quota, so the OverQuota raise is
-        #            outside the transaction.  If we did the raise
-        #            here, our usage updates would be discarded, but
-        #            they're not invalidated by being over-quota.
-
-        # Create the reservations
-        if not overs:
-            reservations = []
-            for resource, delta in deltas.items():
-                usage = usages[resource]
-                allocated_id = None
-                if is_allocated_reserve:
-                    try:
-                        quota = _quota_get(context, project_id, resource,
-                                           session=session)
-                    except exception.ProjectQuotaNotFound:
-                        # If we were using the default quota, create DB entry
-                        quota = quota_create(context, project_id, resource,
-                                             quotas[resource], 0)
-                    # Since there's no reserved/total for allocated, update
-                    # allocated immediately and subtract on rollback if needed
-                    quota_allocated_update(context, project_id, resource,
-                                           quota.allocated + delta)
-                    allocated_id = quota.id
-                    usage = None
-                reservation = _reservation_create(
-                    elevated, str(uuid.uuid4()), usage, project_id, resource,
-                    delta, expire, session=session, allocated_id=allocated_id)
-
-                reservations.append(reservation.uuid)
-
-                # Also update the reserved quantity
-                # NOTE(Vek): Again, we are only concerned here about
-                #            positive increments.  Here, though, we're
-                #            worried about the following scenario:
-                #
-                #            1) User initiates resize down.
-                #            2) User allocates a new instance.
-                #            3) Resize down fails or is reverted.
-                #            4) User is now over quota.
-                #
-                #            To prevent this, we only update the
-                #            reserved value if the delta is positive.
-                if delta > 0 and not is_allocated_reserve:
-                    usages[resource].reserved += delta
+        (reservations, unders,
+         overs, usages, allocated) = _quota_reserve(
+            context, session, resources, quotas, deltas, expire,
+            until_refresh, max_age, project_id, is_allocated_reserve)
 
     if unders:
         LOG.warning("Change will make usage less than 0 for the following "
@@ -1310,6 +1327,46 @@ def quota_reserve(context, resources, quotas, deltas, expire,
     return reservations
 
 
+@require_context
+@_retry_on_deadlock
+def quota_reserve_multi(context, resources, per_project, expire,
+                        until_refresh, max_age):
+    """Reserve quotas for several projects in a single transaction.
+
+    :param per_project: a list of (project_id, quotas, deltas) tuples,
+                        one entry per project to reserve for.
+    :returns: a list of reservation uuid lists, in per_project order.
+
+    Unlike quota_reserve, an over-quota project aborts the whole
+    transaction: rolling back the usage refreshes is harmless and it
+    guarantees reservations already created for other projects in the
+    batch are not leaked.
+    """
+    all_reservations = []
+    all_unders = []
+    session = get_session()
+    with session.begin():
+        for project_id, quotas, deltas in per_project:
+            (reservations, unders,
+             overs, usages, allocated) = _quota_reserve(
+                context, session, resources, quotas, deltas, expire,
+                until_refresh, max_age, project_id, False)
+            if overs:
+                usages = {k: dict(in_use=v.in_use, reserved=v.reserved,
+                                  allocated=allocated.get(k, 0))
+                          for k, v in usages.items()}
+                raise exception.OverQuota(overs=sorted(overs), quotas=quotas,
+                                          usages=usages)
+            all_reservations.append(reservations)
+            all_unders.extend(unders)
+
+    if all_unders:
+        LOG.warning("Change will make usage less than 0 for the following "
+                    "resources: %s", all_unders)
+
+    return all_reservations
+
+
 def _quota_reservations(session, context, reservations):
     """Return the relevant reservations."""
 
@@ -5282,24 +5339,59 @@ def transfer_get(context, transfer_id):
     return _transfer_get(context, transfer_id)
 
 
+@require_context
+def transfer_get_with_volume(context, transfer_id):
+    """Return the transfer and its volume in a single joined query."""
+    # Load the same relationships as _volume_get_query, so consumers of
+    # the volume (e.g. usage notifications emitted after the session is
+    # gone) never trigger lazy loads on a detached instance.
+    query = model_query(context, models.Transfer).\
+        add_entity(models.Volume).\
+        filter(models.Transfer.volume_id == models.Volume.id,
+               models.Transfer.id == transfer_id).\
+        options(joinedload(models.Volume.volume_metadata)).\
+        options(joinedload(models.Volume.volume_type)).\
+        options(joinedload(models.Volume.volume_attachment)).\
+        options(joinedload(models.Volume.consistencygroup)).\
+        options(joinedload(models.Volume.group))
+
+    if is_admin_context(context):
+        query = query.options(
+            joinedload(models.Volume.volume_admin_metadata))
+    else:
+        query = query.filter(models.Volume.project_id == context.project_id)
+
+    result = query.first()
+
+    if not result:
+        raise exception.TransferNotFound(transfer_id=transfer_id)
+
+    return result
+
+
 def _translate_transfers(transfers):
     fields = ('id', 'volume_id', 'display_name', 'created_at', 'deleted')
     return [{k: transfer[k] for k in fields} for transfer in transfers]
 
 
 @require_admin_context
-def transfer_get_all(context):
-    results = model_query(context, models.Transfer).all()
+def transfer_get_all(context, filters=None):
+    query = model_query(context, models.Transfer)
+    if filters:
+        query = query.filter_by(**filters)
+    results = query.all()
     return _translate_transfers(results)
 
 
 @require_context
-def transfer_get_all_by_project(context, project_id):
+def transfer_get_all_by_project(context, project_id, filters=None):
     authorize_project_context(context, project_id)
 
     query = (model_query(context, models.Transfer)
              .filter(models.Volume.id == models.Transfer.volume_id,
                      models.Volume.project_id == project_id))
+    if filters:
+        query = query.filter_by(**filters)
     results = query.all()
     return _translate_transfers(results)
 
@@ -0,0 +1,26 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from sqlalchemy import LargeBinary, MetaData, Table
+
+
+def upgrade(migrate_engine):
+    """Store the transfer crypt hash as raw digest bytes.
+
+    Rows written before this migration keep the hex encoding of the
+    digest; the transfer API verifies both representations.
+    """
+    meta = MetaData()
+    meta.bind = migrate_engine
+
+    transfers = Table('transfers', meta, autoload=True)
+    transfers.c.crypt_hash.alter(type=LargeBinary(255))
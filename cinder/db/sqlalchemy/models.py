@@ -28,6 +28,7 @@ from sqlalchemy import bindparam
 from sqlalchemy import Column, Integer, String, Text, schema, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy import ForeignKey, DateTime, Boolean, UniqueConstraint
+from sqlalchemy import LargeBinary
 from sqlalchemy.orm import backref, column_property, relationship, validates
 
 
@@ -812,7 +813,7 @@ class Transfer(BASE, CinderBase):
     volume_id = Column(String(36), ForeignKey('volumes.id'), index=True)
     display_name = Column(String(255))
     salt = Column(String(255))
-    crypt_hash = Column(String(255))
+    crypt_hash = Column(LargeBinary(255))
     expires_at = Column(DateTime)
     volume = relationship(Volume, backref="transfer",
                           foreign_keys=volume_id,
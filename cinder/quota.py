@@ -365,14 +365,7 @@ class DbQuotaDriver(object):
         """
 
         # Set up the reservation expiration
-        if expire is None:
-            expire = CONF.reservation_expire
-        if isinstance(expire, six.integer_types):
-            expire = datetime.timedelta(seconds=expire)
-        if isinstance(expire, datetime.timedelta):
-            expire = timeutils.utcnow() + expire
-        if not isinstance(expire, datetime.datetime):
-            raise exception.InvalidReservationExpiration(expire=expire)
+        expire = self._get_expiration(expire)
 
         # If project_id is None, then we use the project_id in context
         if project_id is None:
@@ -387,6 +380,48 @@ class DbQuotaDriver(object):
         return self._reserve(context, resources, quotas, deltas, expire,
                              project_id)
 
+    @staticmethod
+    def _get_expiration(expire):
+        """Normalize a reservation expiration to a datetime."""
+        if expire is None:
+            expire = CONF.reservation_expire
+        if isinstance(expire, six.integer_types):
+            expire = datetime.timedelta(seconds=expire)
+        if isinstance(expire, datetime.timedelta):
+            expire = timeutils.utcnow() + expire
+        if not isinstance(expire, datetime.datetime):
+            raise exception.InvalidReservationExpiration(expire=expire)
+        return expire
+
+    def reserve_multi(self, context, resources, per_project_deltas,
+                      expire=None):
+        """Check quotas and reserve resources for several projects at once.
+
+        All reservations are made in a single database transaction, so
+        this costs one round trip however many projects are involved and
+        either every reservation is created or none is.
+
+        :param context: The request context, for access checks.  Must be
+                        able to see the quotas of every listed project.
+        :param resources: A dictionary of the registered resources.
+        :param per_project_deltas: An ordered sequence of (project_id,
+                                   deltas) pairs, one per project.
+        :param expire: An optional reservation expiration, interpreted as
+                       in reserve().
+        :returns: A list of reservation uuid lists, in per_project_deltas
+                  order.
+        """
+        expire = self._get_expiration(expire)
+
+        per_project = []
+        for project_id, deltas in per_project_deltas:
+            quotas = self._get_quotas(context, resources, deltas.keys(),
+                                      has_sync=True, project_id=project_id)
+            per_project.append((project_id, quotas, deltas))
+        return db.quota_reserve_multi(context, resources, per_project,
+                                      expire, CONF.until_refresh,
+                                      CONF.max_age)
+
     def _reserve(self, context, resources, quotas, deltas, expire, project_id):
         # NOTE(Vek): Most of the work here has to be done in the DB
         #            API, because we have to do it in a transaction,
@@ -1030,6 +1065,30 @@ class QuotaEngine(object):
 
         return reservations
 
+    def reserve_multi(self, context, per_project_deltas, expire=None):
+        """Check quotas and reserve resources for several projects at once.
+
+        The reservations for every project are created in one database
+        transaction; either all succeed or none is created.
+
+        :param context: The request context, for access checks.  Must be
+                        able to see the quotas of every listed project.
+        :param per_project_deltas: An ordered sequence of (project_id,
+                                   deltas) pairs, one per project.
+        :param expire: An optional reservation expiration, interpreted as
+                       in reserve().
+        :returns: A list of reservation uuid lists, in per_project_deltas
+                  order.
+        """
+
+        reservations = self._driver.reserve_multi(context, self.resources,
+                                                  per_project_deltas,
+                                                  expire=expire)
+
+        LOG.debug("Created reservations %s", reservations)
+
+        return reservations
+
     def commit(self, context, reservations, project_id=None):
         """Commit reservations.
 
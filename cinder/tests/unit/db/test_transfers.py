@@ -35,7 +35,7 @@ class TransfersTableTestCase(test.TestCase):
         """Create a transfer object."""
         transfer = {'display_name': 'display_name',
                     'salt': 'salt',
-                    'crypt_hash': 'crypt_hash'}
+                    'crypt_hash': b'crypt_hash'}
         if volume_id is not None:
             transfer['volume_id'] = volume_id
         return db.transfer_create(self.ctxt, transfer)['id']
@@ -38,6 +38,7 @@ from cinder.volume import group_types as volume_group_types
 class MigrationsMixin(test_migrations.WalkVersionsMixin):
     """Test sqlalchemy-migrate migrations."""
 
+    BINARY_TYPE = sqlalchemy.types._Binary
     BOOL_TYPE = sqlalchemy.types.BOOLEAN
     TIME_TYPE = sqlalchemy.types.DATETIME
     INTEGER_TYPE = sqlalchemy.types.INTEGER
@@ -360,6 +361,11 @@ class MigrationsMixin(test_migrations.WalkVersionsMixin):
         self.assertIsInstance(services.c.uuid.type,
                               self.VARCHAR_TYPE)
 
+    def _check_113(self, engine, data):
+        transfers = db_utils.get_table(engine, 'transfers')
+        self.assertIsInstance(transfers.c.crypt_hash.type,
+                              self.BINARY_TYPE)
+
     def test_walk_versions(self):
         self.walk_versions(False, False)
         self.assert_each_foreign_key_is_part_of_an_index()
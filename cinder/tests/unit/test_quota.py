@@ -382,6 +382,12 @@ class FakeDriver(object):
                             expire, project_id))
         return self.reservations
 
+    def reserve_multi(self, context, resources, per_project_deltas,
+                      expire=None):
+        self.called.append(('reserve_multi', context, resources,
+                            per_project_deltas, expire))
+        return [self.reservations for _unused in per_project_deltas]
+
     def commit(self, context, reservations, project_id=None):
         self.called.append(('commit', context, reservations, project_id))
 
@@ -785,6 +791,24 @@ class QuotaEngineTestCase(test.TestCase):
                           'resv-03',
                           'resv-04', ], result3)
 
+    def test_reserve_multi(self):
+        context = FakeContext(None, None)
+        driver = FakeDriver(reservations=['resv-01',
+                                          'resv-02', ])
+        quota_obj = self._make_quota_obj(driver)
+        per_project = [('fake_project', dict(test_resource1=4)),
+                       ('other_project', dict(test_resource1=-4))]
+        result = quota_obj.reserve_multi(context, per_project)
+
+        self.assertEqual([('reserve_multi',
+                           context,
+                           quota_obj.resources,
+                           per_project,
+                           None), ],
+                         driver.called)
+        self.assertEqual([['resv-01', 'resv-02'],
+                          ['resv-01', 'resv-02'], ], result)
+
     def test_commit(self):
         context = FakeContext(None, None)
         driver = FakeDriver()
@@ -1374,6 +1398,44 @@ class DbQuotaDriverTestCase(DbQuotaDriverBaseTestCase):
                           ('quota_reserve', expire, 0, 86400), ], self.calls)
         self.assertEqual(['resv-1', 'resv-2', 'resv-3'], result)
 
+    def _mock_quota_reserve_multi(self):
+        def fake_quota_reserve_multi(context, resources, per_project, expire,
+                                     until_refresh, max_age):
+            self.calls.append(('quota_reserve_multi',
+                               [entry[0] for entry in per_project],
+                               expire, until_refresh, max_age))
+            return [['resv-%s' % entry[0]] for entry in per_project]
+        self.mock_object(db, 'quota_reserve_multi', fake_quota_reserve_multi)
+
+    def test_reserve_multi(self):
+        self._mock_get_project_quotas()
+        self._mock_quota_reserve_multi()
+        result = self.driver.reserve_multi(
+            FakeContext('test_project', 'test_class'),
+            quota.QUOTAS.resources,
+            [('test_project', dict(volumes=2)),
+             ('other_project', dict(volumes=-2))])
+
+        expire = timeutils.utcnow() + datetime.timedelta(seconds=86400)
+        self.assertEqual(['get_project_quotas',
+                          'get_project_quotas',
+                          ('quota_reserve_multi',
+                           ['test_project', 'other_project'],
+                           expire, 0, 0), ], self.calls)
+        self.assertEqual([['resv-test_project'],
+                          ['resv-other_project'], ], result)
+
+    def test_reserve_multi_bad_expire(self):
+        self._mock_get_project_quotas()
+        self._mock_quota_reserve_multi()
+        self.assertRaises(exception.InvalidReservationExpiration,
+                          self.driver.reserve_multi,
+                          FakeContext('test_project', 'test_class'),
+                          quota.QUOTAS.resources,
+                          [('test_project', dict(volumes=2))],
+                          expire='invalid')
+        self.assertEqual([], self.calls)
+
     def _mock_quota_destroy_by_project(self):
         def fake_quota_destroy_by_project(context, project_id):
             self.calls.append(('quota_destroy_by_project', project_id))
@@ -2158,6 +2220,87 @@ class QuotaReserveSqlAlchemyTestCase(test.TestCase):
                                        delta=-2 * 1024), ])
 
 
+class QuotaReserveMultiSqlAlchemyTestCase(test.TestCase):
+    # quota_reserve_multi mostly orchestrates _quota_reserve (tested
+    # above) per project inside one transaction, so these tests mock
+    # _quota_reserve and check the fan-out, ordering and whole-batch
+    # abort semantics.
+
+    def setUp(self):
+        super(QuotaReserveMultiSqlAlchemyTestCase, self).setUp()
+
+        test_case = self
+
+        class RecordingSession(FakeSession):
+            def __exit__(self, exc_type, exc_value, exc_traceback):
+                test_case.rolled_back = exc_type is not None
+                return False
+
+        self.rolled_back = None
+        self.session = RecordingSession()
+        self.mock_object(sqa_api, 'get_session', lambda: self.session)
+        self.expire = timeutils.utcnow() + datetime.timedelta(seconds=3600)
+        self.reserve_calls = []
+
+    def _mock_quota_reserve(self, overs_for=None, unders_for=None):
+        def fake_quota_reserve(context, session, resources, quotas, deltas,
+                               expire, until_refresh, max_age, project_id,
+                               is_allocated_reserve):
+            self.assertIs(self.session, session)
+            self.reserve_calls.append(project_id)
+            if project_id == overs_for:
+                usage = mock.Mock(in_use=10, reserved=0)
+                return ([], [], ['volumes'], {'volumes': usage}, {})
+            unders = ['volumes'] if project_id == unders_for else []
+            return (['resv-%s' % project_id], unders, [], {}, {})
+        self.mock_object(sqa_api, '_quota_reserve', fake_quota_reserve)
+
+    def test_quota_reserve_multi(self):
+        self._mock_quota_reserve()
+        per_project = [('project1', dict(volumes=10), dict(volumes=2)),
+                       ('project2', dict(volumes=10), dict(volumes=-2))]
+
+        result = sqa_api.quota_reserve_multi(None, quota.QUOTAS.resources,
+                                             per_project, self.expire, 0, 0)
+
+        self.assertEqual(['project1', 'project2'], self.reserve_calls)
+        self.assertEqual([['resv-project1'], ['resv-project2']], result)
+        self.assertFalse(self.rolled_back)
+
+    def test_quota_reserve_multi_over_quota_aborts_all(self):
+        self._mock_quota_reserve(overs_for='project2')
+        per_project = [('project1', dict(volumes=10), dict(volumes=2)),
+                       ('project2', dict(volumes=10), dict(volumes=-2))]
+
+        exc = self.assertRaises(exception.OverQuota,
+                                sqa_api.quota_reserve_multi,
+                                None, quota.QUOTAS.resources, per_project,
+                                self.expire, 0, 0)
+
+        # The first project's reservations were already created when the
+        # second went over quota, so the exception must propagate out of
+        # the transaction to roll them back with it.
+        self.assertEqual(['project1', 'project2'], self.reserve_calls)
+        self.assertTrue(self.rolled_back)
+        self.assertEqual(['volumes'], exc.kwargs['overs'])
+        self.assertEqual(dict(volumes=10), exc.kwargs['quotas'])
+        self.assertEqual({'volumes': dict(in_use=10, reserved=0,
+                                          allocated=0)},
+                         exc.kwargs['usages'])
+
+    def test_quota_reserve_multi_unders_warning(self):
+        self._mock_quota_reserve(unders_for='project2')
+        mock_warning = self.mock_object(sqa_api.LOG, 'warning')
+        per_project = [('project1', dict(volumes=10), dict(volumes=2)),
+                       ('project2', dict(volumes=10), dict(volumes=-20))]
+
+        result = sqa_api.quota_reserve_multi(None, quota.QUOTAS.resources,
+                                             per_project, self.expire, 0, 0)
+
+        self.assertEqual([['resv-project1'], ['resv-project2']], result)
+        self.assertTrue(mock_warning.called)
+
+
 class QuotaVolumeTypeReservationTestCase(test.TestCase):
 
     def setUp(self):
@@ -47,6 +47,7 @@ class VolumeTransferTestCase(test.TestCase):
                          'Unexpected state')
         calls = [mock.call(self.ctxt, mock.ANY, "transfer.create.start"),
                  mock.call(self.ctxt, mock.ANY, "transfer.create.end")]
+        transfer_api._notify_pool.waitall()
         mock_notify.assert_has_calls(calls)
         self.assertEqual(2, mock_notify.call_count)
 
@@ -55,6 +56,7 @@ class VolumeTransferTestCase(test.TestCase):
         self.assertEqual('available', volume['status'], 'Unexpected state')
         calls = [mock.call(self.ctxt, mock.ANY, "transfer.delete.start"),
                  mock.call(self.ctxt, mock.ANY, "transfer.delete.end")]
+        transfer_api._notify_pool.waitall()
         mock_notify.assert_has_calls(calls)
         self.assertEqual(4, mock_notify.call_count)
 
@@ -100,6 +102,7 @@ class VolumeTransferTestCase(test.TestCase):
 
         calls = [mock.call(self.ctxt, mock.ANY, "transfer.create.start"),
                  mock.call(self.ctxt, mock.ANY, "transfer.create.end")]
+        transfer_api._notify_pool.waitall()
         mock_notify.assert_has_calls(calls)
         self.assertEqual(2, mock_notify.call_count)
 
@@ -114,6 +117,7 @@ class VolumeTransferTestCase(test.TestCase):
         # Because the InvalidVolume exception is raised in tx_api, so there is
         # only transfer.accept.start called and missing transfer.accept.end.
         calls = [mock.call(self.ctxt, mock.ANY, "transfer.accept.start")]
+        transfer_api._notify_pool.waitall()
         mock_notify.assert_has_calls(calls)
         self.assertEqual(3, mock_notify.call_count)
 
@@ -134,7 +138,7 @@ class VolumeTransferTestCase(test.TestCase):
                           self.ctxt, transfer['id'], transfer['auth_key'])
 
     @mock.patch.object(QUOTAS, "limit_check")
-    @mock.patch.object(QUOTAS, "reserve")
+    @mock.patch.object(QUOTAS, "reserve_multi")
     @mock.patch.object(QUOTAS, "add_volume_type_opts")
     @mock.patch('cinder.volume.utils.notify_about_volume_usage')
     def test_transfer_accept(self, mock_notify, mock_quota_voltype,
@@ -149,6 +153,8 @@ class VolumeTransferTestCase(test.TestCase):
 
         self.ctxt.user_id = fake.USER2_ID
         self.ctxt.project_id = fake.PROJECT2_ID
+        mock_quota_reserve.return_value = [['RESERVATION'],
+                                           ['DONOR_RESERVATION']]
         response = tx_api.accept(self.ctxt,
                                  transfer['id'],
                                  transfer['auth_key'])
@@ -163,6 +169,7 @@ class VolumeTransferTestCase(test.TestCase):
 
         calls = [mock.call(self.ctxt, mock.ANY, "transfer.accept.start"),
                  mock.call(self.ctxt, mock.ANY, "transfer.accept.end")]
+        transfer_api._notify_pool.waitall()
         mock_notify.assert_has_calls(calls)
         # The notify_about_volume_usage is called twice at create(),
         # and twice at accept().
@@ -176,11 +183,10 @@ class VolumeTransferTestCase(test.TestCase):
                  mock.call(self.ctxt, release_opt, fake.VOLUME_TYPE_ID)]
         mock_quota_voltype.assert_has_calls(calls)
 
-        # QUOTAS.reserve
-        calls = [mock.call(mock.ANY, **reserve_opt),
-                 mock.call(mock.ANY, project_id=fake.PROJECT_ID,
-                           **release_opt)]
-        mock_quota_reserve.assert_has_calls(calls)
+        # QUOTAS.reserve_multi makes both projects' reservations at once
+        mock_quota_reserve.assert_called_once_with(
+            mock.ANY, [(fake.PROJECT2_ID, reserve_opt),
+                       (fake.PROJECT_ID, release_opt)])
 
         # QUOTAS.limit_check
         values = {'per_volume_gigabytes': 1}
@@ -188,7 +194,7 @@ class VolumeTransferTestCase(test.TestCase):
                                                  project_id=fake.PROJECT2_ID,
                                                  **values)
 
-    @mock.patch.object(QUOTAS, "reserve")
+    @mock.patch.object(QUOTAS, "reserve_multi")
     @mock.patch.object(QUOTAS, "add_volume_type_opts")
     @mock.patch('cinder.volume.utils.notify_about_volume_usage')
     def test_transfer_accept_over_quota(self, mock_notify, mock_quota_voltype,
@@ -220,6 +226,7 @@ class VolumeTransferTestCase(test.TestCase):
                           transfer['auth_key'])
         # notification of transfer.accept is sent only after quota check
         # passes
+        transfer_api._notify_pool.waitall()
         self.assertEqual(2, mock_notify.call_count)
 
     @mock.patch.object(QUOTAS, "limit_check")
@@ -251,6 +258,7 @@ class VolumeTransferTestCase(test.TestCase):
                           transfer['auth_key'])
         # notification of transfer.accept is sent only after quota check
         # passes
+        transfer_api._notify_pool.waitall()
         self.assertEqual(2, mock_notify.call_count)
 
     def test_transfer_get(self):
@@ -286,6 +294,7 @@ class VolumeTransferTestCase(test.TestCase):
 
         calls = [mock.call(self.ctxt, mock.ANY, "transfer.create.start"),
                  mock.call(self.ctxt, mock.ANY, "transfer.create.end")]
+        transfer_api._notify_pool.waitall()
         mock_notify.assert_has_calls(calls)
         self.assertEqual(2, mock_notify.call_count)
         # force delete volume
@@ -749,6 +749,45 @@ VOLUME_GET_ITER_CAPACITY_RESPONSE = etree.XML("""
     'total_size': VOLUME_SIZE_TOTAL,
 })
 
+VOLUME_GET_ITER_CAPACITIES_RESPONSE = etree.XML("""
+    <results status="passed">
+        <num-records>3</num-records>
+        <attributes-list>
+            <volume-attributes>
+                <volume-id-attributes>
+                    <junction-path>/%(volume1)s</junction-path>
+                </volume-id-attributes>
+                <volume-space-attributes>
+                    <size-available>%(available_size)s</size-available>
+                    <size-total>%(total_size)s</size-total>
+                </volume-space-attributes>
+            </volume-attributes>
+            <volume-attributes>
+                <volume-id-attributes>
+                    <junction-path>/%(volume2)s</junction-path>
+                </volume-id-attributes>
+                <volume-space-attributes>
+                    <size-available>%(available_size)s</size-available>
+                    <size-total>%(total_size)s</size-total>
+                </volume-space-attributes>
+            </volume-attributes>
+            <volume-attributes>
+                <volume-id-attributes>
+                </volume-id-attributes>
+                <volume-space-attributes>
+                    <size-available>%(available_size)s</size-available>
+                    <size-total>%(total_size)s</size-total>
+                </volume-space-attributes>
+            </volume-attributes>
+        </attributes-list>
+    </results>
+""" % {
+    'volume1': VOLUME_NAMES[0],
+    'volume2': VOLUME_NAMES[1],
+    'available_size': VOLUME_SIZE_AVAILABLE,
+    'total_size': VOLUME_SIZE_TOTAL,
+})
+
 VOLUME_GET_ITER_LIST_RESPONSE = etree.XML("""
   <results status="passed">
     <attributes-list>
@@ -524,6 +524,16 @@ class NetAppBaseClientTestCase(test.TestCase):
         self.client.send_request.assert_called_once_with('snapshot-delete',
                                                          asserted_api_args)
 
+    def test_delete_snapshots(self):
+        self.mock_object(self.client, 'delete_snapshot')
+
+        self.client.delete_snapshots(fake.SNAPSHOT['volume_id'],
+                                     ['snap1', 'snap2'])
+
+        self.client.delete_snapshot.assert_has_calls([
+            mock.call(fake.SNAPSHOT['volume_id'], 'snap1'),
+            mock.call(fake.SNAPSHOT['volume_id'], 'snap2')])
+
     def test_create_cg_snapshot(self):
         self.mock_object(self.client, '_start_cg_snapshot',
                          return_value=fake.CONSISTENCY_GROUP_ID)
@@ -1432,6 +1432,53 @@ class NetAppCmodeClientTestCase(test.TestCase):
                           self.client.get_flexvol_capacity,
                           flexvol_path='fake_path')
 
+    def test_get_flexvol_capacities(self):
+
+        api_response = netapp_api.NaElement(
+            fake_client.VOLUME_GET_ITER_CAPACITIES_RESPONSE)
+        mock_send_iter_request = self.mock_object(
+            self.client, 'send_iter_request', return_value=api_response)
+
+        capacities = self.client.get_flexvol_capacities()
+
+        volume_get_iter_args = {
+            'desired-attributes': {
+                'volume-attributes': {
+                    'volume-id-attributes': {
+                        'junction-path': None,
+                    },
+                    'volume-space-attributes': {
+                        'size-available': None,
+                        'size-total': None,
+                    },
+                }
+            },
+        }
+        mock_send_iter_request.assert_called_once_with(
+            'volume-get-iter', volume_get_iter_args)
+
+        expected_capacity = {
+            'size-total': fake_client.VOLUME_SIZE_TOTAL,
+            'size-available': fake_client.VOLUME_SIZE_AVAILABLE,
+        }
+        expected = {
+            '/%s' % fake_client.VOLUME_NAMES[0]: expected_capacity,
+            '/%s' % fake_client.VOLUME_NAMES[1]: expected_capacity,
+        }
+        self.assertEqual(expected, capacities)
+
+    def test_get_flexvol_capacities_not_found(self):
+
+        api_response = netapp_api.NaElement(
+            fake_client.NO_RECORDS_RESPONSE)
+        self.mock_object(self.client,
+                         'send_iter_request',
+                         return_value=api_response)
+
+        capacities = self.client.get_flexvol_capacities()
+
+        self.assertEqual({}, capacities)
+
     def test_list_flexvols(self):
 
         api_response = netapp_api.NaElement(
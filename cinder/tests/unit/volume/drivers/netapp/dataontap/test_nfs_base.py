@@ -17,7 +17,9 @@
 Unit tests for the NetApp NFS storage driver
 """
 import copy
+import errno
 import os
+import stat
 import threading
 import time
 
@@ -26,7 +28,6 @@ import mock
 from os_brick.remotefs import remotefs as remotefs_brick
 from oslo_concurrency import processutils
 from oslo_utils import units
-import shutil
 
 from cinder import context
 from cinder import exception
@@ -81,6 +82,31 @@ class NetAppNfsDriverTestCase(test.TestCase):
         self.assertTrue(mock_check_flags.called)
         self.assertTrue(mock_super_do_setup.called)
 
+    @ddt.data({'share_opts': None, 'expected': '-o fsc'},
+              {'share_opts': '-o vers=3', 'expected': '-o vers=3 -o fsc'},
+              {'share_opts': '-o vers=3,fsc', 'expected': '-o vers=3,fsc'})
+    @ddt.unpack
+    @mock.patch.object(nfs.NfsDriver, '_ensure_share_mounted')
+    def test_ensure_share_mounted_fsc(self, mock_super_mount, share_opts,
+                                      expected):
+        self.driver.configuration.netapp_use_fsc = True
+        self.driver.shares = {fake.NFS_SHARE: share_opts}
+
+        self.driver._ensure_share_mounted(fake.NFS_SHARE)
+
+        self.assertEqual(expected, self.driver.shares[fake.NFS_SHARE])
+        mock_super_mount.assert_called_once_with(fake.NFS_SHARE)
+
+    @mock.patch.object(nfs.NfsDriver, '_ensure_share_mounted')
+    def test_ensure_share_mounted_no_fsc(self, mock_super_mount):
+        self.driver.configuration.netapp_use_fsc = False
+        self.driver.shares = {fake.NFS_SHARE: None}
+
+        self.driver._ensure_share_mounted(fake.NFS_SHARE)
+
+        self.assertIsNone(self.driver.shares[fake.NFS_SHARE])
+        mock_super_mount.assert_called_once_with(fake.NFS_SHARE)
+
     def test_get_share_capacity_info(self):
         mock_get_capacity = self.mock_object(self.driver, '_get_capacity_info')
         mock_get_capacity.return_value = fake.CAPACITY_VALUES
@@ -122,6 +148,33 @@ class NetAppNfsDriverTestCase(test.TestCase):
         get_capacity.assert_has_calls([
             mock.call(flexvol_path=fake.EXPORT_PATH)])
 
+    def test_get_capacity_info_cached(self):
+        expected = fake.CAPACITY_VALUES
+        get_capacity = self.driver.zapi_client.get_flexvol_capacity
+        expiry = time.time() + nfs_base.CAPACITY_TTL_SECONDS
+        self.driver._capacity_cache = {
+            fake.EXPORT_PATH: (expiry, fake.CAPACITIES),
+        }
+
+        result = self.driver._get_capacity_info(fake.NFS_SHARE)
+
+        self.assertEqual(expected, result)
+        get_capacity.assert_not_called()
+
+    def test_get_capacity_info_cache_expired(self):
+        expected = fake.CAPACITY_VALUES
+        get_capacity = self.driver.zapi_client.get_flexvol_capacity
+        get_capacity.return_value = fake.CAPACITIES
+        self.driver._capacity_cache = {
+            fake.EXPORT_PATH: (time.time() - 1, {}),
+        }
+
+        result = self.driver._get_capacity_info(fake.NFS_SHARE)
+
+        self.assertEqual(expected, result)
+        get_capacity.assert_has_calls([
+            mock.call(flexvol_path=fake.EXPORT_PATH)])
+
     def test_get_pool(self):
         pool = self.driver.get_pool({'provider_location': 'fake-share'})
 
@@ -326,16 +379,13 @@ class NetAppNfsDriverTestCase(test.TestCase):
 
     def test__get_volume_location(self):
         volume_id = fake.VOLUME_ID
-        self.mock_object(self.driver, '_get_host_ip',
-                         return_value='168.124.10.12')
-        self.mock_object(self.driver, '_get_export_path',
-                         return_value='/fake_mount_path')
+        self.mock_object(self.driver, '_get_provider_location',
+                         return_value='168.124.10.12:/fake_mount_path')
 
         retval = self.driver._get_volume_location(volume_id)
 
         self.assertEqual('168.124.10.12:/fake_mount_path', retval)
-        self.driver._get_host_ip.assert_called_once_with(volume_id)
-        self.driver._get_export_path.assert_called_once_with(volume_id)
+        self.driver._get_provider_location.assert_called_once_with(volume_id)
 
     def test__clone_backing_file_for_volume(self):
         self.assertRaises(NotImplementedError,
@@ -352,15 +402,15 @@ class NetAppNfsDriverTestCase(test.TestCase):
 
         self.assertEqual(fake.PROVIDER_LOCATION, retval)
 
-    @ddt.data(None, processutils.ProcessExecutionError)
-    def test__volume_not_present(self, side_effect):
+    @ddt.data(True, False)
+    def test__volume_not_present(self, exists):
         self.mock_object(self.driver, '_get_volume_path')
-        self.mock_object(self.driver, '_try_execute', side_effect=side_effect)
+        self.mock_object(os.path, 'lexists', return_value=exists)
 
         retval = self.driver._volume_not_present(
             fake.MOUNT_PATH, fake.VOLUME_NAME)
 
-        self.assertEqual(side_effect is not None, retval)
+        self.assertEqual(not exists, retval)
 
     @mock.patch.object(time, 'sleep')
     def test__try_execute_exception(self, patched_sleep):
@@ -400,7 +450,7 @@ class NetAppNfsDriverTestCase(test.TestCase):
         mock_copy_image = self.mock_object(
             remotefs.RemoteFSDriver, 'copy_image_to_volume')
         mock_register_image = self.mock_object(
-            self.driver, '_register_image_in_cache')
+            self.driver, '_spawn_image_cache_registration')
 
         self.driver.copy_image_to_volume('fake_context',
                                          fake.NFS_VOLUME,
@@ -427,6 +477,24 @@ class NetAppNfsDriverTestCase(test.TestCase):
         self.assertEqual(exc is not None, mock_log.warning.called)
         self.assertEqual(1, mock_log.info.call_count)
 
+    def test__spawn_image_cache_registration(self):
+
+        class FakeTimer(object):
+            def start(self):
+                pass
+
+        fake_timer = FakeTimer()
+        self.mock_object(fake_timer, 'start')
+        self.mock_object(threading, 'Timer', return_value=fake_timer)
+
+        self.driver._spawn_image_cache_registration(
+            fake.NFS_VOLUME, fake.IMAGE_FILE_ID)
+
+        threading.Timer.assert_called_once_with(
+            0, self.driver._register_image_in_cache,
+            args=(fake.NFS_VOLUME, fake.IMAGE_FILE_ID))
+        fake_timer.start.assert_called_once_with()
+
     @ddt.data(True, False)
     def test_do_clone_rel_img_cache(self, path_exists):
         self.mock_object(nfs_base.LOG, 'info')
@@ -457,9 +525,9 @@ class NetAppNfsDriverTestCase(test.TestCase):
             'dir/' + fake.CLONE_DESTINATION_NAME)
 
     def test__spawn_clean_cache_job_clean_job_setup(self):
-        self.driver.cleaning = True
+        self.driver._cleaning_lock.acquire()
+        self.addCleanup(self.driver._cleaning_lock.release)
         mock_debug_log = self.mock_object(nfs_base.LOG, 'debug')
-        self.mock_object(utils, 'synchronized', return_value=lambda f: f)
 
         retval = self.driver._spawn_clean_cache_job()
 
@@ -473,7 +541,6 @@ class NetAppNfsDriverTestCase(test.TestCase):
                 pass
 
         fake_timer = FakeTimer()
-        self.mock_object(utils, 'synchronized', return_value=lambda f: f)
         self.mock_object(fake_timer, 'start')
         self.mock_object(nfs_base.LOG, 'debug')
         self.mock_object(self.driver, '_clean_image_cache')
@@ -482,10 +549,170 @@ class NetAppNfsDriverTestCase(test.TestCase):
         retval = self.driver._spawn_clean_cache_job()
 
         self.assertIsNone(retval)
+        self.assertTrue(self.driver._cleaning_lock.locked())
+        self.driver._cleaning_lock.release()
         threading.Timer.assert_called_once_with(
             0, self.driver._clean_image_cache)
         fake_timer.start.assert_called_once_with()
 
+    def _mock_cache_file_locks(self, busy_names=()):
+        locks = {}
+
+        def fake_external_lock(name, prefix):
+            self.assertEqual('cinder-', prefix)
+            lock = mock.Mock()
+            lock.acquire.return_value = name not in busy_names
+            locks[name] = lock
+            return lock
+
+        self.mock_object(nfs_base.lockutils, 'external_lock',
+                         side_effect=fake_external_lock)
+        return locks
+
+    def test_delete_files_till_bytes_free(self):
+        self.mock_object(self.driver, '_get_mount_point_for_share',
+                         return_value='/fake/mnt')
+        locks = self._mock_cache_file_locks()
+        mock_delete = self.mock_object(
+            self.driver, '_delete_files_at_paths',
+            side_effect=lambda batch: list(batch))
+        file_list = [('file1', units.Gi), ('file3', 2 * units.Gi),
+                     ('file2', 3 * units.Gi)]
+
+        self.driver._delete_files_till_bytes_free(
+            file_list, fake.NFS_SHARE, bytes_to_free=4 * units.Gi)
+
+        # The two largest files satisfy the 4 GiB budget, so the
+        # smallest candidate is never touched.
+        mock_delete.assert_called_once_with(
+            {'/fake/mnt/file2': 3 * units.Gi,
+             '/fake/mnt/file3': 2 * units.Gi})
+        self.assertNotIn('file1', locks)
+        for lock in locks.values():
+            lock.release.assert_called_once_with()
+
+    def test_delete_files_till_bytes_free_partial_failure(self):
+        self.mock_object(self.driver, '_get_mount_point_for_share',
+                         return_value='/fake/mnt')
+        self._mock_cache_file_locks()
+        mock_delete = self.mock_object(
+            self.driver, '_delete_files_at_paths',
+            side_effect=[['/fake/mnt/file2'], ['/fake/mnt/file1']])
+        file_list = [('file1', units.Gi), ('file3', 2 * units.Gi),
+                     ('file2', 3 * units.Gi)]
+
+        self.driver._delete_files_till_bytes_free(
+            file_list, fake.NFS_SHARE, bytes_to_free=4 * units.Gi)
+
+        # Only 3 of the 5 GiB in the first batch were freed, so the
+        # remaining budget pulls the last candidate into a second batch.
+        mock_delete.assert_has_calls([
+            mock.call({'/fake/mnt/file2': 3 * units.Gi,
+                       '/fake/mnt/file3': 2 * units.Gi}),
+            mock.call({'/fake/mnt/file1': units.Gi})])
+
+    def test_delete_files_till_bytes_free_skips_busy_files(self):
+        self.mock_object(self.driver, '_get_mount_point_for_share',
+                         return_value='/fake/mnt')
+        locks = self._mock_cache_file_locks(busy_names=('file2',))
+        mock_delete = self.mock_object(
+            self.driver, '_delete_files_at_paths',
+            side_effect=lambda batch: list(batch))
+        file_list = [('file3', 2 * units.Gi), ('file2', 3 * units.Gi)]
+
+        self.driver._delete_files_till_bytes_free(
+            file_list, fake.NFS_SHARE, bytes_to_free=4 * units.Gi)
+
+        # file2 is being cloned from, so it stays cached and only the
+        # free file is deleted.
+        mock_delete.assert_called_once_with(
+            {'/fake/mnt/file3': 2 * units.Gi})
+        self.assertFalse(locks['file2'].release.called)
+        locks['file3'].release.assert_called_once_with()
+
+    def test_delete_files_till_bytes_free_batch_failure_stops(self):
+        self.mock_object(self.driver, '_get_mount_point_for_share',
+                         return_value='/fake/mnt')
+        self._mock_cache_file_locks()
+        mock_delete = self.mock_object(self.driver, '_delete_files_at_paths',
+                                       return_value=[])
+        file_list = [('file1', units.Gi), ('file2', units.Gi)]
+
+        self.driver._delete_files_till_bytes_free(
+            file_list, fake.NFS_SHARE, bytes_to_free=4 * units.Gi)
+
+        self.assertEqual(1, mock_delete.call_count)
+
+    def test_delete_files_till_bytes_free_no_budget(self):
+        mock_delete = self.mock_object(self.driver, '_delete_files_at_paths')
+
+        self.driver._delete_files_till_bytes_free(
+            [('file1', units.Gi)], fake.NFS_SHARE, bytes_to_free=0)
+
+        self.assertFalse(mock_delete.called)
+
+    def test_delete_files_at_paths_chunks_at_argv_limit(self):
+        # 104 KiB sysconf value leaves the 4 KiB floor as the limit.
+        self.mock_object(os, 'sysconf', return_value=104 * units.Ki)
+        mock_chunk = self.mock_object(self.driver, '_delete_file_chunk',
+                                      side_effect=lambda chunk: list(chunk))
+        paths = ['/fake/mnt/%s' % ('a' * 3000),
+                 '/fake/mnt/%s' % ('b' * 3000)]
+
+        result = self.driver._delete_files_at_paths(paths)
+
+        self.assertEqual(paths, result)
+        mock_chunk.assert_has_calls([mock.call([paths[0]]),
+                                     mock.call([paths[1]])])
+
+    def test_delete_files_at_paths_single_chunk(self):
+        self.mock_object(os, 'sysconf', return_value=200 * units.Ki)
+        mock_chunk = self.mock_object(self.driver, '_delete_file_chunk',
+                                      side_effect=lambda chunk: list(chunk))
+        paths = ['/fake/mnt/file1', '/fake/mnt/file2']
+
+        result = self.driver._delete_files_at_paths(paths)
+
+        self.assertEqual(paths, result)
+        mock_chunk.assert_called_once_with(paths)
+
+    def test_delete_file_chunk_in_process(self):
+        self.driver._execute_as_root = False
+        mock_delete = self.mock_object(self.driver, '_delete_file_at_path',
+                                       side_effect=[True, False, True])
+        mock_execute = self.mock_object(self.driver, '_execute')
+
+        result = self.driver._delete_file_chunk(['/p1', '/p2', '/p3'])
+
+        self.assertEqual(['/p1', '/p3'], result)
+        self.assertFalse(mock_execute.called)
+        self.assertEqual(3, mock_delete.call_count)
+
+    def test_delete_file_chunk_rm(self):
+        self.driver._execute_as_root = True
+        mock_execute = self.mock_object(self.driver, '_execute')
+
+        result = self.driver._delete_file_chunk(['/p1', '/p2'])
+
+        self.assertEqual(['/p1', '/p2'], result)
+        mock_execute.assert_called_once_with('rm', '-f', '/p1', '/p2',
+                                             run_as_root=True)
+
+    def test_delete_file_chunk_rm_failure_retries_per_file(self):
+        self.driver._execute_as_root = True
+        self.mock_object(
+            self.driver, '_execute',
+            side_effect=processutils.ProcessExecutionError)
+        mock_delete = self.mock_object(self.driver, '_delete_file_at_path',
+                                       side_effect=[True, False])
+
+        result = self.driver._delete_file_chunk(['/p1', '/p2'])
+
+        # One bad path must not abort the batch; the good one is still
+        # deleted on the per-file retry.
+        self.assertEqual(['/p1'], result)
+        self.assertEqual(2, mock_delete.call_count)
+
     def test_cleanup_volume_on_failure(self):
         path = '%s/%s' % (fake.NFS_SHARE, fake.NFS_VOLUME['name'])
         mock_local_path = self.mock_object(self.driver, 'local_path')
@@ -509,18 +736,16 @@ class NetAppNfsDriverTestCase(test.TestCase):
         self.assertEqual(0, mock_delete.call_count)
 
     def test_get_export_ip_path_volume_id_provided(self):
-        mock_get_host_ip = self.mock_object(self.driver, '_get_host_ip')
-        mock_get_host_ip.return_value = fake.IPV4_ADDRESS
-
-        mock_get_export_path = self.mock_object(
-            self.driver, '_get_export_path')
-        mock_get_export_path.return_value = fake.EXPORT_PATH
+        mock_get_provider_location = self.mock_object(
+            self.driver, '_get_provider_location')
+        mock_get_provider_location.return_value = fake.NFS_SHARE
 
-        expected = (fake.IPV4_ADDRESS, fake.EXPORT_PATH)
+        expected = (fake.SHARE_IP, fake.EXPORT_PATH)
 
         result = self.driver._get_export_ip_path(fake.VOLUME_ID)
 
         self.assertEqual(expected, result)
+        mock_get_provider_location.assert_called_once_with(fake.VOLUME_ID)
 
     def test_get_export_ip_path_share_provided(self):
         expected = (fake.SHARE_IP, fake.EXPORT_PATH)
@@ -530,19 +755,17 @@ class NetAppNfsDriverTestCase(test.TestCase):
         self.assertEqual(expected, result)
 
     def test_get_export_ip_path_volume_id_and_share_provided(self):
-        mock_get_host_ip = self.mock_object(self.driver, '_get_host_ip')
-        mock_get_host_ip.return_value = fake.IPV4_ADDRESS
-
-        mock_get_export_path = self.mock_object(
-            self.driver, '_get_export_path')
-        mock_get_export_path.return_value = fake.EXPORT_PATH
+        mock_get_provider_location = self.mock_object(
+            self.driver, '_get_provider_location')
+        mock_get_provider_location.return_value = fake.NFS_SHARE
 
-        expected = (fake.IPV4_ADDRESS, fake.EXPORT_PATH)
+        expected = (fake.SHARE_IP, fake.EXPORT_PATH)
 
         result = self.driver._get_export_ip_path(
             fake.VOLUME_ID, fake.NFS_SHARE)
 
         self.assertEqual(expected, result)
+        mock_get_provider_location.assert_called_once_with(fake.VOLUME_ID)
 
     def test_get_export_ip_path_no_args(self):
         self.assertRaises(exception.InvalidInput,
@@ -587,8 +810,13 @@ class NetAppNfsDriverTestCase(test.TestCase):
     def test_extend_volume(self):
 
         new_size = 100
-        volume_copy = copy.copy(fake.VOLUME)
-        volume_copy['size'] = new_size
+        volume_copy = {
+            'id': fake.VOLUME['id'],
+            'name': fake.VOLUME['name'],
+            'host': fake.VOLUME['host'],
+            'volume_type_id': None,
+            'size': new_size,
+        }
 
         path = '%s/%s' % (fake.NFS_SHARE, fake.NFS_VOLUME['name'])
         self.mock_object(self.driver,
@@ -612,9 +840,6 @@ class NetAppNfsDriverTestCase(test.TestCase):
     def test_extend_volume_resize_error(self):
 
         new_size = 100
-        volume_copy = copy.copy(fake.VOLUME)
-        volume_copy['size'] = new_size
-
         path = '%s/%s' % (fake.NFS_SHARE, fake.NFS_VOLUME['name'])
         self.mock_object(self.driver,
                          'local_path',
@@ -639,8 +864,13 @@ class NetAppNfsDriverTestCase(test.TestCase):
     def test_extend_volume_qos_error(self):
 
         new_size = 100
-        volume_copy = copy.copy(fake.VOLUME)
-        volume_copy['size'] = new_size
+        volume_copy = {
+            'id': fake.VOLUME['id'],
+            'name': fake.VOLUME['name'],
+            'host': fake.VOLUME['host'],
+            'volume_type_id': None,
+            'size': new_size,
+        }
 
         path = '%s/%s' % (fake.NFS_SHARE, fake.NFS_VOLUME['name'])
         self.mock_object(self.driver,
@@ -730,10 +960,101 @@ class NetAppNfsDriverTestCase(test.TestCase):
                     thin=thin)
         self.assertEqual(expected, result)
 
+    def test_move_nfs_file(self):
+        mock_link = self.mock_object(os, 'link')
+        mock_unlink = self.mock_object(os, 'unlink')
+        mock_fallback = self.mock_object(self.driver,
+                                         '_move_nfs_file_fallback')
+
+        result = self.driver._move_nfs_file('/fake/src', '/fake/dst')
+
+        self.assertTrue(result)
+        mock_link.assert_called_once_with('/fake/src', '/fake/dst')
+        mock_unlink.assert_called_once_with('/fake/src')
+        self.assertFalse(mock_fallback.called)
+
+    def test_move_nfs_file_source_unlink_error(self):
+        self.mock_object(os, 'link')
+        self.mock_object(os, 'unlink',
+                         side_effect=OSError(errno.ENOENT, 'gone'))
+        mock_fallback = self.mock_object(self.driver,
+                                         '_move_nfs_file_fallback')
+
+        result = self.driver._move_nfs_file('/fake/src', '/fake/dst')
+
+        self.assertTrue(result)
+        self.assertFalse(mock_fallback.called)
+
+    def test_move_nfs_file_destination_exists(self):
+        self.mock_object(os, 'link',
+                         side_effect=OSError(errno.EEXIST, 'exists'))
+        mock_unlink = self.mock_object(os, 'unlink')
+        mock_fallback = self.mock_object(self.driver,
+                                         '_move_nfs_file_fallback')
+
+        result = self.driver._move_nfs_file('/fake/src', '/fake/dst')
+
+        self.assertFalse(result)
+        self.assertFalse(mock_unlink.called)
+        self.assertFalse(mock_fallback.called)
+
+    def test_move_nfs_file_link_error_falls_back(self):
+        self.mock_object(os, 'link',
+                         side_effect=OSError(errno.EXDEV, 'cross-device'))
+        mock_unlink = self.mock_object(os, 'unlink')
+        mock_fallback = self.mock_object(
+            self.driver, '_move_nfs_file_fallback', return_value=True)
+
+        result = self.driver._move_nfs_file('/fake/src', '/fake/dst')
+
+        self.assertTrue(result)
+        mock_fallback.assert_called_once_with('/fake/src', '/fake/dst')
+        self.assertFalse(mock_unlink.called)
+
+    def test_move_nfs_file_fallback(self):
+        self.mock_object(os.path, 'exists', return_value=False)
+        mock_execute = self.mock_object(self.driver, '_execute')
+
+        result = self.driver._move_nfs_file_fallback('/fake/src', '/fake/dst')
+
+        self.assertTrue(result)
+        mock_execute.assert_called_once_with(
+            'mv', '/fake/src', '/fake/dst',
+            run_as_root=self.driver._execute_as_root)
+
+    def test_move_nfs_file_fallback_destination_exists(self):
+        self.mock_object(os.path, 'exists', return_value=True)
+        mock_execute = self.mock_object(self.driver, '_execute')
+
+        result = self.driver._move_nfs_file_fallback('/fake/src', '/fake/dst')
+
+        self.assertFalse(result)
+        self.assertFalse(mock_execute.called)
+
     def test_get_share_mount_and_vol_from_vol_ref(self):
         self.mock_object(na_utils, 'resolve_hostname',
                          return_value='10.12.142.11')
-        self.mock_object(os.path, 'isfile', return_value=True)
+        self.mock_object(os, 'stat',
+                         return_value=mock.Mock(st_mode=stat.S_IFREG))
+        self.driver._mounted_shares = [self.fake_nfs_export_1]
+        vol_path = "%s/%s" % (self.fake_nfs_export_1, 'test_file_name')
+        vol_ref = {'source-name': vol_path}
+        self.driver._ensure_shares_mounted = mock.Mock()
+        self.driver._get_mount_point_for_share = mock.Mock(
+            return_value=self.fake_mount_point)
+
+        (share, mount, file_path, vol_stat) = (
+            self.driver._get_share_mount_and_vol_from_vol_ref(vol_ref))
+
+        self.assertEqual(self.fake_nfs_export_1, share)
+        self.assertEqual(self.fake_mount_point, mount)
+        self.assertEqual('test_file_name', file_path)
+        self.assertIsNotNone(vol_stat)
+
+    def test_get_share_mount_and_vol_from_vol_ref_exact_match(self):
+        mock_resolve = self.mock_object(na_utils, 'resolve_hostname')
+        self.mock_object(os, 'stat',
+                         return_value=mock.Mock(st_mode=stat.S_IFREG))
         self.driver._mounted_shares = [self.fake_nfs_export_1]
         vol_path = "%s/%s" % (self.fake_nfs_export_1, 'test_file_name')
         vol_ref = {'source-name': vol_path}
@@ -741,12 +1062,15 @@ class NetAppNfsDriverTestCase(test.TestCase):
         self.driver._get_mount_point_for_share = mock.Mock(
             return_value=self.fake_mount_point)
 
-        (share, mount, file_path) = (
+        (share, mount, file_path, vol_stat) = (
             self.driver._get_share_mount_and_vol_from_vol_ref(vol_ref))
 
         self.assertEqual(self.fake_nfs_export_1, share)
         self.assertEqual(self.fake_mount_point, mount)
         self.assertEqual('test_file_name', file_path)
+        self.assertIsNotNone(vol_stat)
+        # An exact share match must not pay for host name resolution.
+        self.assertFalse(mock_resolve.called)
 
     def test_get_share_mount_and_vol_from_vol_ref_with_bad_ref(self):
         self.mock_object(na_utils, 'resolve_hostname',
@@ -802,14 +1126,14 @@ class NetAppNfsDriverTestCase(test.TestCase):
         vol_path = "%s/%s" % (self.fake_nfs_export_1, test_file)
         vol_ref = {'source-name': vol_path}
         self.driver._check_volume_type = mock.Mock()
-        shutil.move = mock.Mock()
+        self.mock_object(os, 'rename')
         self.mock_object(self.driver, '_execute')
         self.driver._ensure_shares_mounted = mock.Mock()
         self.driver._get_mount_point_for_share = mock.Mock(
             return_value=self.fake_mount_point)
         self.driver._get_share_mount_and_vol_from_vol_ref = mock.Mock(
             return_value=(self.fake_nfs_export_1, self.fake_mount_point,
-                          test_file))
+                          test_file, mock.Mock(st_size=1074253824)))
         mock_get_specs = self.mock_object(na_utils, 'get_volume_extra_specs')
         mock_get_specs.return_value = {}
         self.mock_object(self.driver, '_do_qos_for_volume')
@@ -841,7 +1165,8 @@ class NetAppNfsDriverTestCase(test.TestCase):
             return_value=self.fake_mount_point)
         self.driver._get_share_mount_and_vol_from_vol_ref = mock.Mock(
             return_value=(self.fake_nfs_export_1, self.fake_mount_point,
-                          test_file))
+                          test_file, mock.Mock(st_size=1074253824)))
+        self.mock_object(os, 'rename')
         self.driver._execute = mock.Mock(side_effect=OSError)
         mock_get_specs = self.mock_object(na_utils, 'get_volume_extra_specs')
         mock_get_specs.return_value = {}
@@ -866,8 +1191,7 @@ class NetAppNfsDriverTestCase(test.TestCase):
         test_file = 'test_file_name'
         self.driver._get_share_mount_and_vol_from_vol_ref = mock.Mock(
             return_value=(self.fake_nfs_export_1, self.fake_mount_point,
-                          test_file))
-        self.mock_object(utils, 'get_file_size', return_value=1073741824)
+                          test_file, mock.Mock(st_size=1073741824)))
         self.driver._mounted_shares = [self.fake_nfs_export_1]
         volume = fake.FAKE_MANAGE_VOLUME
         vol_path = "%s/%s" % (self.fake_nfs_export_1, test_file)
@@ -885,8 +1209,7 @@ class NetAppNfsDriverTestCase(test.TestCase):
         test_file = 'test_file_name'
         self.driver._get_share_mount_and_vol_from_vol_ref = mock.Mock(
             return_value=(self.fake_nfs_export_1, self.fake_mount_point,
-                          test_file))
-        self.mock_object(utils, 'get_file_size', return_value=1073760270)
+                          test_file, mock.Mock(st_size=1073760270)))
         self.driver._mounted_shares = [self.fake_nfs_export_1]
         volume = fake.FAKE_MANAGE_VOLUME
         vol_path = "%s/%s" % (self.fake_nfs_export_1, test_file)
@@ -904,7 +1227,7 @@ class NetAppNfsDriverTestCase(test.TestCase):
         test_file = 'test_file_name'
         self.driver._get_share_mount_and_vol_from_vol_ref = mock.Mock(
             return_value=(self.fake_nfs_export_1, self.fake_mount_point,
-                          test_file))
+                          test_file, mock.Mock(st_size='not-a-size')))
         self.driver._mounted_shares = [self.fake_nfs_export_1]
         volume = fake.FAKE_MANAGE_VOLUME
         vol_path = "%s/%s" % (self.fake_nfs_export_1, test_file)
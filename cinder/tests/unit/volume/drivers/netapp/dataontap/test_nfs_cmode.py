@@ -202,6 +202,9 @@ class NetAppCmodeNfsDriverTestCase(test.TestCase):
         mock_get_aggr_capacities = self.mock_object(
             self.driver.zapi_client, 'get_aggregate_capacities',
             return_value=aggr_capacities)
+        mock_get_capacities = self.mock_object(
+            self.driver.zapi_client, 'get_flexvol_capacities',
+            return_value={})
 
         self.driver.perf_library.get_node_utilization_for_pool = (
             mock.Mock(return_value=30.0))
@@ -247,6 +250,8 @@ class NetAppCmodeNfsDriverTestCase(test.TestCase):
         mock_get_ssc.assert_called_once_with()
         mock_get_aggrs.assert_called_once_with()
         mock_get_aggr_capacities.assert_called_once_with(['aggr1'])
+        mock_get_capacities.assert_called_once_with()
+        self.assertEqual({}, self.driver._capacity_cache)
 
     @ddt.data({}, None)
     def test_get_pool_stats_no_ssc_vols(self, ssc):
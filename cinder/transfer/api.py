@@ -18,14 +18,16 @@ Handles all requests relating to transferring ownership of volumes.
 """
 
 
+import binascii
 import hashlib
 import hmac
 import os
+import threading
 
+from eventlet import greenpool
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import excutils
-import six
 
 from cinder.db import base
 from cinder import exception
@@ -50,82 +52,175 @@ CONF.register_opts(volume_transfer_opts)
 LOG = logging.getLogger(__name__)
 QUOTAS = quota.QUOTAS
 
+# Size of the thread-local random byte pool. Reading os.urandom in chunks
+# this size amortizes the getrandom(2) syscall over many small draws.
+_RAND_POOL_SIZE = 4096
+_rand_pool = threading.local()
+
+
+# Usage notifications are fire-and-forget, so they are emitted from a small
+# greenthread pool to keep the messaging round trip off the API path.
+_notify_pool = greenpool.GreenPool(size=4)
+
+
+def _notify_about_volume_usage(context, volume, event_suffix):
+    _notify_pool.spawn_n(volume_utils.notify_about_volume_usage,
+                         context, volume, event_suffix)
+
+
+def _check_policy(context, action):
+    # The verdict is memoized on the request context, so repeated checks
+    # within one request cost a single policy evaluation while nothing
+    # outlives the request: oslo.policy reloads rules whenever the policy
+    # file changes, and a longer-lived cache would keep bypassing a
+    # tightened policy. Only allows are memoized; a denial raises.
+    memo = getattr(context, '_transfer_policy_memo', None)
+    if memo is None:
+        memo = set()
+        context._transfer_policy_memo = memo
+    if action not in memo:
+        volume_api.check_policy(context, action)
+        memo.add(action)
+
+
+def _random_bytes(length):
+    """Return random bytes served from a thread-local os.urandom pool."""
+    if length >= _RAND_POOL_SIZE:
+        return os.urandom(length)
+    buf = getattr(_rand_pool, 'buf', b'')
+    # Refill after a fork as well, so children never share parent bytes.
+    if len(buf) < length or getattr(_rand_pool, 'pid', None) != os.getpid():
+        buf = os.urandom(_RAND_POOL_SIZE)
+        _rand_pool.pid = os.getpid()
+    _rand_pool.buf = buf[length:]
+    return buf[:length]
+
 
 class API(base.Base):
     """API for interacting volume transfers."""
 
     def __init__(self, db_driver=None):
-        self.volume_api = volume_api.API()
+        self._volume_api = None
         super(API, self).__init__(db_driver)
 
+    @property
+    def volume_api(self):
+        # Constructed lazily: volume_api.API() pulls in scheduler RPC
+        # clients and more, which only the accept path needs.
+        if self._volume_api is None:
+            self._volume_api = volume_api.API()
+        return self._volume_api
+
     def get(self, context, transfer_id):
-        volume_api.check_policy(context, 'get_transfer')
-        rv = self.db.transfer_get(context, transfer_id)
-        return dict(rv)
+        _check_policy(context, 'get_transfer')
+        # The row already supports dict-style access; copying it into a
+        # fresh dict would just duplicate every column value.
+        return self.db.transfer_get(context, transfer_id)
 
     def delete(self, context, transfer_id):
         """Make the RPC call to delete a volume transfer."""
-        volume_api.check_policy(context, 'delete_transfer')
-        transfer = self.db.transfer_get(context, transfer_id)
-
-        volume_ref = self.db.volume_get(context, transfer.volume_id)
-        volume_utils.notify_about_volume_usage(context, volume_ref,
-                                               "transfer.delete.start")
+        _check_policy(context, 'delete_transfer')
+        transfer, volume_ref = self.db.transfer_get_with_volume(context,
+                                                                transfer_id)
+        _notify_about_volume_usage(context, volume_ref,
+                                   "transfer.delete.start")
         if volume_ref['status'] != 'awaiting-transfer':
             LOG.error("Volume in unexpected state")
         self.db.transfer_destroy(context, transfer_id)
-        volume_utils.notify_about_volume_usage(context, volume_ref,
-                                               "transfer.delete.end")
+        _notify_about_volume_usage(context, volume_ref, "transfer.delete.end")
 
     def get_all(self, context, filters=None):
         filters = filters or {}
-        volume_api.check_policy(context, 'get_all_transfers')
+        _check_policy(context, 'get_all_transfers')
+        # Push exact-match filters on real transfer columns down to the
+        # database instead of returning every row; anything else in the
+        # request is ignored, as before.
+        db_filters = {k: filters[k] for k in ('id', 'volume_id',
+                                              'display_name')
+                      if k in filters}
         if context.is_admin and 'all_tenants' in filters:
-            transfers = self.db.transfer_get_all(context)
+            transfers = self.db.transfer_get_all(context, filters=db_filters)
         else:
-            transfers = self.db.transfer_get_all_by_project(context,
-                                                            context.project_id)
+            transfers = self.db.transfer_get_all_by_project(
+                context, context.project_id, filters=db_filters)
         return transfers
 
     def _get_random_string(self, length):
         """Get a random hex string of the specified length."""
-        rndstr = ""
-
         # Note that the string returned by this function must contain only
-        # characters that the recipient can enter on their keyboard. The
-        # function ssh224().hexdigit() achieves this by generating a hash
-        # which will only contain hexadecimal digits.
-        while len(rndstr) < length:
-            rndstr += hashlib.sha224(os.urandom(255)).hexdigest()
+        # characters that the recipient can enter on their keyboard. Hex
+        # encoding the random bytes guarantees this while preserving all of
+        # the entropy drawn from os.urandom.
+        nbytes, odd = divmod(length, 2)
+        rndstr = binascii.hexlify(_random_bytes(nbytes + odd)).decode('ascii')
+        # The default salt/key lengths are even, so the slice is only
+        # needed on the odd-length path.
+        return rndstr[:length] if odd else rndstr
+
+    def _generate_transfer_credentials(self):
+        """Generate the salt, auth key and crypt hash for a new transfer.
 
-        return rndstr[0:length]
+        A single entropy draw and one hexlify cover both random strings.
+        """
+        salt_len = CONF.volume_transfer_salt_length
+        key_len = CONF.volume_transfer_key_length
+        nbytes, odd = divmod(salt_len + key_len, 2)
+        rndstr = binascii.hexlify(_random_bytes(nbytes + odd)).decode('ascii')
+        salt = rndstr[:salt_len]
+        auth_key = rndstr[salt_len:salt_len + key_len]
+        return salt, auth_key, self._get_crypt_hash(salt, auth_key)
 
     def _get_crypt_hash(self, salt, auth_key):
-        """Generate a random hash based on the salt and the auth key."""
-        if not isinstance(salt, (six.binary_type, six.text_type)):
-            salt = str(salt)
-        if isinstance(salt, six.text_type):
+        """Generate a keyed digest of the auth key, using the salt as key."""
+        if isinstance(salt, str):
+            salt = salt.encode('utf-8')
+        if isinstance(auth_key, str):
+            auth_key = auth_key.encode('utf-8')
+        # BLAKE2s is a keyed hash by design, so a single hash pass replaces
+        # the double hashing the HMAC construction needs. The raw digest is
+        # stored as-is; hex encoding would only double its size.  hashlib
+        # only grew blake2s in Python 3.6, so older interpreters keep
+        # writing the HMAC-SHA1 digest instead.
+        if hasattr(hashlib, 'blake2s'):
+            return hashlib.blake2s(auth_key, key=salt[:32],
+                                   digest_size=20).digest()
+        return hmac.new(salt, auth_key, hashlib.sha1).digest()
+
+    def _verify_auth_key(self, transfer, auth_key):
+        """Check an auth key against a transfer's stored crypt hash."""
+        stored_hash = transfer['crypt_hash']
+        if isinstance(stored_hash, str):
+            stored_hash = stored_hash.encode('utf-8')
+        salt = transfer['salt']
+        if isinstance(salt, str):
             salt = salt.encode('utf-8')
-        if not isinstance(auth_key, (six.binary_type, six.text_type)):
-            auth_key = str(auth_key)
-        if isinstance(auth_key, six.text_type):
+        if isinstance(auth_key, str):
             auth_key = auth_key.encode('utf-8')
-        return hmac.new(salt, auth_key, hashlib.sha1).hexdigest()
+        # Rows written before the BLAKE2s change hold an HMAC-SHA1 digest.
+        # hmac.new instead of hmac.digest(): the latter is Python 3.7+.
+        candidates = (self._get_crypt_hash(salt, auth_key),
+                      hmac.new(salt, auth_key, hashlib.sha1).digest())
+        for candidate in candidates:
+            # Rows written before migration 113 store the hex encoding of
+            # the digest instead of the digest itself.
+            if len(stored_hash) == 2 * len(candidate):
+                candidate = binascii.hexlify(candidate)
+            if hmac.compare_digest(candidate, stored_hash):
+                return True
+        return False
 
     def create(self, context, volume_id, display_name):
         """Creates an entry in the transfers table."""
-        volume_api.check_policy(context, 'create_transfer')
+        _check_policy(context, 'create_transfer')
         LOG.info("Generating transfer record for volume %s", volume_id)
         volume_ref = self.db.volume_get(context, volume_id)
         if volume_ref['status'] != "available":
             raise exception.InvalidVolume(reason=_("status must be available"))
 
-        volume_utils.notify_about_volume_usage(context, volume_ref,
-                                               "transfer.create.start")
+        _notify_about_volume_usage(context, volume_ref,
+                                   "transfer.create.start")
         # The salt is just a short random string.
-        salt = self._get_random_string(CONF.volume_transfer_salt_length)
-        auth_key = self._get_random_string(CONF.volume_transfer_key_length)
-        crypt_hash = self._get_crypt_hash(salt, auth_key)
+        salt, auth_key, crypt_hash = self._generate_transfer_credentials()
 
         # TODO(ollie): Transfer expiry needs to be implemented.
         transfer_rec = {'volume_id': volume_id,
@@ -139,8 +234,7 @@ class API(base.Base):
         except Exception:
             LOG.error("Failed to create transfer record for %s", volume_id)
             raise
-        volume_utils.notify_about_volume_usage(context, volume_ref,
-                                               "transfer.create.end")
+        _notify_about_volume_usage(context, volume_ref, "transfer.create.end")
         return {'id': transfer['id'],
                 'volume_id': transfer['volume_id'],
                 'display_name': transfer['display_name'],
@@ -151,18 +245,18 @@ class API(base.Base):
         """Accept a volume that has been offered for transfer."""
         # We must use an elevated context to see the volume that is still
         # owned by the donor.
-        volume_api.check_policy(context, 'accept_transfer')
-        transfer = self.db.transfer_get(context.elevated(), transfer_id)
+        _check_policy(context, 'accept_transfer')
+        elevated = context.elevated()
+        transfer = self.db.transfer_get(elevated, transfer_id)
 
-        crypt_hash = self._get_crypt_hash(transfer['salt'], auth_key)
-        if crypt_hash != transfer['crypt_hash']:
+        if not self._verify_auth_key(transfer, auth_key):
             msg = (_("Attempt to transfer %s with invalid auth key.") %
                    transfer_id)
             LOG.error(msg)
             raise exception.InvalidAuthKey(reason=msg)
 
         volume_id = transfer['volume_id']
-        vol_ref = objects.Volume.get_by_id(context.elevated(), volume_id)
+        vol_ref = objects.Volume.get_by_id(elevated, volume_id)
         if vol_ref['consistencygroup_id']:
             msg = _("Volume %s must not be part of a consistency "
                     "group.") % vol_ref['id']
@@ -178,32 +272,49 @@ class API(base.Base):
             raise exception.VolumeSizeExceedsLimit(
                 size=vol_ref.size, limit=quotas['per_volume_gigabytes'])
 
-        try:
-            reserve_opts = {'volumes': 1, 'gigabytes': vol_ref.size}
-            QUOTAS.add_volume_type_opts(context,
-                                        reserve_opts,
-                                        vol_ref.volume_type_id)
-            reservations = QUOTAS.reserve(context, **reserve_opts)
-        except exception.OverQuota as e:
-            quota_utils.process_reserve_over_quota(context, e,
-                                                   resource='volumes',
-                                                   size=vol_ref.size)
-        try:
-            donor_id = vol_ref['project_id']
-            reserve_opts = {'volumes': -1, 'gigabytes': -vol_ref.size}
-            QUOTAS.add_volume_type_opts(context,
-                                        reserve_opts,
-                                        vol_ref.volume_type_id)
-            donor_reservations = QUOTAS.reserve(context.elevated(),
-                                                project_id=donor_id,
-                                                **reserve_opts)
-        except Exception:
-            donor_reservations = None
-            LOG.exception("Failed to update quota donating volume"
-                          " transfer id %s", transfer_id)
+        donor_id = vol_ref['project_id']
+        accept_opts = {'volumes': 1, 'gigabytes': vol_ref.size}
+        donor_opts = {'volumes': -1, 'gigabytes': -vol_ref.size}
+        QUOTAS.add_volume_type_opts(context, accept_opts,
+                                    vol_ref.volume_type_id)
+        QUOTAS.add_volume_type_opts(context, donor_opts,
+                                    vol_ref.volume_type_id)
+
+        reservations = donor_reservations = None
+        if donor_id != context.project_id:
+            try:
+                # Reserve for the acceptor and the donor in a single DB
+                # transaction instead of one round trip per project.
+                reservations, donor_reservations = QUOTAS.reserve_multi(
+                    elevated, [(context.project_id, accept_opts),
+                               (donor_id, donor_opts)])
+            except exception.OverQuota as e:
+                quota_utils.process_reserve_over_quota(context, e,
+                                                       resource='volumes',
+                                                       size=vol_ref.size)
+            except Exception:
+                LOG.exception("Failed to update quota donating volume"
+                              " transfer id %s", transfer_id)
+        if reservations is None:
+            # Either the volume stays within one project, or the fused
+            # reservation failed on the donor side; the donor adjustment
+            # remains best effort, so reserve per project here.
+            try:
+                reservations = QUOTAS.reserve(context, **accept_opts)
+            except exception.OverQuota as e:
+                quota_utils.process_reserve_over_quota(context, e,
+                                                       resource='volumes',
+                                                       size=vol_ref.size)
+            if donor_id == context.project_id:
+                try:
+                    donor_reservations = QUOTAS.reserve(elevated,
+                                                        project_id=donor_id,
+                                                        **donor_opts)
+                except Exception:
+                    LOG.exception("Failed to update quota donating volume"
+                                  " transfer id %s", transfer_id)
 
-        volume_utils.notify_about_volume_usage(context, vol_ref,
-                                               "transfer.accept.start")
+        _notify_about_volume_usage(context, vol_ref, "transfer.accept.start")
         try:
             # Transfer ownership of the volume now, must use an elevated
             # context.
@@ -211,7 +322,7 @@ class API(base.Base):
                                             vol_ref,
                                             context.user_id,
                                             context.project_id)
-            self.db.transfer_accept(context.elevated(),
+            self.db.transfer_accept(elevated,
                                     transfer_id,
                                     context.user_id,
                                     context.project_id)
@@ -226,9 +337,10 @@ class API(base.Base):
                     QUOTAS.rollback(context, donor_reservations,
                                     project_id=donor_id)
 
-        vol_ref = self.db.volume_get(context, volume_id)
-        volume_utils.notify_about_volume_usage(context, vol_ref,
-                                               "transfer.accept.end")
+        # Refresh the volume we already have instead of fetching a brand
+        # new copy; the ownership fields changed during accept_transfer.
+        vol_ref.refresh()
+        _notify_about_volume_usage(context, vol_ref, "transfer.accept.end")
         return {'id': transfer_id,
                 'display_name': transfer['display_name'],
                 'volume_id': vol_ref['id']}
@@ -315,6 +315,16 @@ class Client(object):
         api_args = {'volume': volume_name, 'snapshot': snapshot_name}
         self.send_request('snapshot-delete', api_args)
 
+    def delete_snapshots(self, volume_name, snapshot_names):
+        """Deletes a group of snapshots of a single volume.
+
+        ONTAPI has no bulk snapshot delete, so the requests are issued
+        one by one over the established connection; this keeps a single
+        entry point per volume that a batch API can replace.
+        """
+        for snapshot_name in snapshot_names:
+            self.delete_snapshot(volume_name, snapshot_name)
+
     def create_cg_snapshot(self, volume_names, snapshot_name):
         """Creates a consistency group snapshot out of one or more flexvols.
 
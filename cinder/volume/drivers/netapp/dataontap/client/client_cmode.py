@@ -925,6 +925,58 @@ class Client(client_base.Client):
             'size-available': size_available,
         }
 
+    def get_flexvol_capacities(self):
+        """Gets capacities of all flexvols, keyed by junction path.
+
+        A single volume-get-iter call returns the space attributes of
+        every flexvol on the vserver, so callers that need capacities
+        for many flexvols can avoid issuing one query per flexvol.
+        """
+
+        api_args = {
+            'desired-attributes': {
+                'volume-attributes': {
+                    'volume-id-attributes': {
+                        'junction-path': None,
+                    },
+                    'volume-space-attributes': {
+                        'size-available': None,
+                        'size-total': None,
+                    },
+                }
+            },
+        }
+
+        result = self.send_iter_request('volume-get-iter', api_args)
+
+        attributes_list = result.get_child_by_name(
+            'attributes-list') or netapp_api.NaElement('none')
+
+        capacities = {}
+        for volume_attributes in attributes_list.get_children():
+
+            volume_id_attributes = volume_attributes.get_child_by_name(
+                'volume-id-attributes') or netapp_api.NaElement('none')
+            volume_space_attributes = volume_attributes.get_child_by_name(
+                'volume-space-attributes') or netapp_api.NaElement('none')
+
+            junction_path = volume_id_attributes.get_child_content(
+                'junction-path')
+            size_available = volume_space_attributes.get_child_content(
+                'size-available')
+            size_total = volume_space_attributes.get_child_content(
+                'size-total')
+            if (not junction_path or size_total is None or
+                    size_available is None):
+                continue
+
+            capacities[junction_path] = {
+                'size-total': float(size_total),
+                'size-available': float(size_available),
+            }
+
+        return capacities
+
     def list_flexvols(self):
         """Returns the names of the flexvols on the controller."""
 
@@ -217,7 +217,7 @@ class NetApp7modeNfsDriver(nfs_base.NetAppNfsDriver):
         """
         if self._is_filer_ip(ip) and shares:
             for share in shares:
-                ip_sh = share.split(':')[0]
+                ip_sh = share.partition(':')[0]
                 if self._is_filer_ip(ip_sh):
                     LOG.debug('Share match found for ip %s', ip)
                     return share
@@ -372,6 +372,7 @@ class NetApp7modeNfsDriver(nfs_base.NetAppNfsDriver):
             except exception.SnapshotIsBusy:
                 self.zapi_client.mark_snapshot_for_deletion(
                     flexvol_name, cgsnapshot['id'])
+                self._mark_snapshot_cleanup_needed()
 
         return None, None
 
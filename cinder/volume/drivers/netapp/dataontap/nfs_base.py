@@ -21,14 +21,21 @@
 Volume driver for NetApp NFS storage.
 """
 
-import copy
-import math
+import collections
+import ctypes
+import errno
+import heapq
 import os
+import random
 import re
+import select
 import shutil
+import stat
+import sys
 import threading
 import time
 
+from oslo_concurrency import lockutils
 from oslo_concurrency import processutils
 from oslo_config import cfg
 from oslo_log import log as logging
@@ -51,6 +58,31 @@ from cinder.volume import utils as volume_utils
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
 HOUSEKEEPING_INTERVAL_SECONDS = 600  # ten minutes
+PROVIDER_LOCATION_TTL_SECONDS = 30
+PROVIDER_LOCATION_CACHE_SIZE = 4096
+IMAGE_CACHE_INDEX_TTL_SECONDS = 30
+SNAPSHOT_CLEANUP_IDLE_SECONDS = 600
+HOSTNAME_TTL_SECONDS = 600
+CAPACITY_TTL_SECONDS = 20
+
+# Magic prefixes of the container formats qemu-img can report; anything
+# unrecognized is treated as raw.
+IMAGE_MAGICS = (
+    (b'QFI\xfb', 'qcow2'),
+    (b'KDMV', 'vmdk'),
+    (b'VMDK', 'vmdk'),
+    (b'conectix', 'vpc'),
+    (b'vhdxfile', 'vhdx'),
+)
+
+# inotify event masks, from <sys/inotify.h>.
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+
+NFS_LOC_PATTERN = re.compile(
+    r'^nfs://(([\w\-\.]+:{1}[\d]+|[\w\-\.]+)(/[^\/].*)'
+    r'*(/[^\/\\\\]+)$)')
 
 
 @six.add_metaclass(utils.TraceWrapperWithABCMetaclass)
@@ -83,6 +115,20 @@ class NetAppNfsDriver(driver.ManageableVD,
         self.configuration.append_config_values(na_opts.netapp_nfs_extra_opts)
         self.backend_name = self.host.split('@')[1]
         self.loopingcalls = loopingcalls.LoopingCalls()
+        self._provider_location_cache = {}
+        self._provider_location_lock = threading.Lock()
+        # Held while an image cache cleaning run is in flight.
+        self._cleaning_lock = threading.Lock()
+        self._mount_point_cache = {}
+        self._img_cache_index = {}
+        self._img_cache_lock = threading.Lock()
+        self._snapshot_cleanup_needed = True
+        self._snapshot_cleanup_deadline = 0
+        self._hostname_cache = {}
+        self._share_index = None
+        self._share_ip_index = None
+        self._share_set = None
+        self._capacity_cache = {}
 
     def do_setup(self, context):
         super(NetAppNfsDriver, self).do_setup(context)
@@ -111,13 +157,33 @@ class NetAppNfsDriver(driver.ManageableVD,
             self._handle_ems_logging,
             loopingcalls.ONE_HOUR)
 
+    def _mark_snapshot_cleanup_needed(self):
+        """Asks the housekeeping task to scan on its next tick."""
+        self._snapshot_cleanup_needed = True
+
     def _delete_snapshots_marked_for_deletion(self):
+        # This runs every minute; skip the flexvol enumeration and the
+        # ZAPI query while this driver has not marked anything since the
+        # last scan. Other hosts sharing the backend can mark snapshots
+        # too, so an idle driver still rescans once the deadline passes.
+        now = time.time()
+        if (not self._snapshot_cleanup_needed and
+                now < self._snapshot_cleanup_deadline):
+            return
+        self._snapshot_cleanup_needed = False
+        self._snapshot_cleanup_deadline = (
+            now + SNAPSHOT_CLEANUP_IDLE_SECONDS)
         volume_list = self._get_backing_flexvol_names()
         snapshots = self.zapi_client.get_snapshots_marked_for_deletion(
             volume_list)
+        # Hand the client one request per FlexVol instead of one call per
+        # snapshot.
+        snapshots_by_volume = collections.defaultdict(list)
         for snapshot in snapshots:
-            self.zapi_client.delete_snapshot(
-                snapshot['volume_name'], snapshot['name'])
+            snapshots_by_volume[snapshot['volume_name']].append(
+                snapshot['name'])
+        for volume_name, snapshot_names in snapshots_by_volume.items():
+            self.zapi_client.delete_snapshots(volume_name, snapshot_names)
 
     def _handle_ems_logging(self):
         """Log autosupport messages."""
@@ -155,6 +221,8 @@ class NetAppNfsDriver(driver.ManageableVD,
             self._do_qos_for_volume(volume, extra_specs)
             model_update = self._get_volume_model_update(volume) or {}
             model_update['provider_location'] = volume['provider_location']
+            self._invalidate_provider_location(volume['id'])
+            self._invalidate_capacity_cache(volume['provider_location'])
             return model_update
         except Exception:
             LOG.exception("Exception creating vol %(name)s on "
@@ -201,6 +269,7 @@ class NetAppNfsDriver(driver.ManageableVD,
                 self._get_volume_model_update(destination_volume) or {})
             model_update['provider_location'] = destination_volume[
                 'provider_location']
+            self._invalidate_provider_location(destination_volume['id'])
 
             return model_update
         except Exception:
@@ -278,12 +347,13 @@ class NetAppNfsDriver(driver.ManageableVD,
 
         path = self._get_volume_path(nfs_share, file_name)
         self._delete(path)
+        self._invalidate_capacity_cache(nfs_share)
 
     def _get_volume_location(self, volume_id):
         """Returns NFS mount address as <nfs_ip_address>:<nfs_mount_dir>."""
-        nfs_server_ip = self._get_host_ip(volume_id)
-        export_path = self._get_export_path(volume_id)
-        return nfs_server_ip + ':' + export_path
+        # The stored provider location already has the ip:path form, so
+        # hand it back as is instead of splitting and rejoining it.
+        return self._get_provider_location(volume_id)
 
     def _clone_backing_file_for_volume(self, volume_name, clone_name,
                                        volume_id, share=None,
@@ -302,43 +372,74 @@ class NetAppNfsDriver(driver.ManageableVD,
 
     def _get_provider_location(self, volume_id):
         """Returns provider location for given volume."""
+        # The location is fetched several times while servicing a single
+        # request (host ip, export path, snapshot delete), so keep a
+        # short-lived copy around instead of going to the DB each time.
+        now = time.time()
+        with self._provider_location_lock:
+            cached = self._provider_location_cache.get(volume_id)
+            if cached is not None and cached[1] > now:
+                return cached[0]
         volume = self.db.volume_get(self._context, volume_id)
-        return volume.provider_location
+        location = volume.provider_location
+        with self._provider_location_lock:
+            if (len(self._provider_location_cache) >=
+                    PROVIDER_LOCATION_CACHE_SIZE):
+                self._provider_location_cache.clear()
+            self._provider_location_cache[volume_id] = (
+                location, now + PROVIDER_LOCATION_TTL_SECONDS)
+        return location
+
+    def _invalidate_provider_location(self, volume_id):
+        """Drops any cached provider location for the given volume."""
+        with self._provider_location_lock:
+            self._provider_location_cache.pop(volume_id, None)
+
+    @staticmethod
+    def _split_provider_location(provider_location):
+        """Splits an ip:path provider location into its two parts."""
+        host, _sep, export_path = provider_location.partition(':')
+        return host, export_path
 
     def _get_host_ip(self, volume_id):
         """Returns IP address for the given volume."""
-        return self._get_provider_location(volume_id).rsplit(':')[0]
+        return self._split_provider_location(
+            self._get_provider_location(volume_id))[0]
 
     def _get_export_path(self, volume_id):
         """Returns NFS export path for the given volume."""
-        return self._get_provider_location(volume_id).rsplit(':')[1]
+        return self._split_provider_location(
+            self._get_provider_location(volume_id))[1]
 
     def _volume_not_present(self, nfs_mount, volume_name):
         """Check if volume exists."""
+        # The share is mounted locally, so a stat answers this without
+        # forking ls through rootwrap.
+        path = self._get_volume_path(nfs_mount, volume_name)
         try:
-            self._try_execute('ls', self._get_volume_path(nfs_mount,
-                                                          volume_name))
-        except processutils.ProcessExecutionError:
-            # If the volume isn't present
+            return not os.path.lexists(path)
+        except OSError:
             return True
-        return False
 
     def _try_execute(self, *command, **kwargs):
         # NOTE(vish): Volume commands can partially fail due to timing, but
         #             running them a second time on failure will usually
         #             recover nicely.
         tries = 0
+        num_shell_tries = self.configuration.num_shell_tries
         while True:
             try:
                 self._execute(*command, **kwargs)
                 return True
             except processutils.ProcessExecutionError:
                 tries += 1
-                if tries >= self.configuration.num_shell_tries:
+                if tries >= num_shell_tries:
                     raise
                 LOG.exception("Recovering from a failed execute. "
                               "Try number %s", tries)
-                time.sleep(tries ** 2)
+                # Jitter the capped exponential backoff so concurrent
+                # operations retrying against the same filer don't line up.
+                time.sleep(random.uniform(0, min(2 ** tries, 30)))
 
     def _get_volume_path(self, nfs_share, volume_name):
         """Get volume path.
@@ -353,6 +454,53 @@ class NetAppNfsDriver(driver.ManageableVD,
         return os.path.join(self._get_mount_point_for_share(nfs_share),
                             volume_name)
 
+    def _get_mount_point_for_share(self, nfs_share):
+        """Returns the mount point for the given share, memoized.
+
+        The mount point is derived from the share string alone, so cache
+        it; hot paths such as the image cache scan ask for the same
+        share's mount point once per file otherwise.
+        """
+        mount_point = self._mount_point_cache.get(nfs_share)
+        if mount_point is None:
+            mount_point = super(
+                NetAppNfsDriver, self)._get_mount_point_for_share(nfs_share)
+            self._mount_point_cache[nfs_share] = mount_point
+        return mount_point
+
+    def _ensure_share_mounted(self, nfs_share):
+        """Mount a share, adding the FS-Cache mount option if configured.
+
+        Mounting with ``fsc`` lets the kernel cache NFS reads on local
+        disk through FS-Cache, which benefits read-heavy paths such as
+        cloning from frequently used Glance images.
+        """
+        if self.configuration.netapp_use_fsc:
+            share_opts = self.shares.get(nfs_share)
+            opt_tokens = re.split('[ ,]', share_opts) if share_opts else []
+            if 'fsc' not in opt_tokens:
+                self.shares[nfs_share] = (
+                    '%s -o fsc' % share_opts if share_opts else '-o fsc')
+        super(NetAppNfsDriver, self)._ensure_share_mounted(nfs_share)
+
+    def _ensure_shares_mounted(self):
+        super(NetAppNfsDriver, self)._ensure_shares_mounted()
+        # Warm the mount point cache so loops over the mounted shares,
+        # such as the manage-existing candidate scan, never re-derive a
+        # mount point per candidate.
+        for share in self._mounted_shares:
+            self._get_mount_point_for_share(share)
+        # Resolve every share hostname up front as well, so no request
+        # pays for a synchronous DNS lookup on its first use of a share;
+        # expired entries still fall through to a live resolve.
+        try:
+            self._mounted_shares_in_ip_form()
+        except Exception:
+            # Resolution failures surface when the share is actually
+            # used; prefetching is best effort.
+            LOG.debug('Could not pre-resolve share host names.',
+                      exc_info=True)
+
     def _update_volume_stats(self):
         """Retrieve stats info from volume group."""
         raise NotImplementedError()
@@ -371,7 +519,18 @@ class NetAppNfsDriver(driver.ManageableVD,
             context, volume, image_service, image_id)
         LOG.info('Copied image to volume %s using regular download.',
                  volume['id'])
-        self._register_image_in_cache(volume, image_id)
+        self._spawn_image_cache_registration(volume, image_id)
+
+    def _spawn_image_cache_registration(self, volume, image_id):
+        """Registers the image in cache without holding up the caller.
+
+        The registration clone only warms the cache and already swallows
+        its own failures, so the request thread does not need to wait
+        for it.
+        """
+        t = threading.Timer(0, self._register_image_in_cache,
+                            args=(volume, image_id))
+        t.start()
 
     def _register_image_in_cache(self, volume, image_id):
         """Stores image in the cache."""
@@ -391,75 +550,132 @@ class NetAppNfsDriver(driver.ManageableVD,
         result = []
         if getattr(self, '_mounted_shares', None):
             for share in self._mounted_shares:
-                dir = self._get_mount_point_for_share(share)
-                file_name = 'img-cache-%s' % image_id
-                file_path = '%s/%s' % (dir, file_name)
-                if os.path.isfile(file_path):
+                if image_id in self._image_cache_ids(share):
                     LOG.debug('Found cache file for image %(image_id)s'
                               ' on share %(share)s',
                               {'image_id': image_id, 'share': share})
-                    result.append((share, file_name))
+                    result.append((share, 'img-cache-%s' % image_id))
         return result
 
+    def _image_cache_ids(self, share):
+        """Returns the set of image ids with a cache file on the share.
+
+        One directory listing per share replaces a stat per (share,
+        image) pair, which would otherwise hit the NFS server for every
+        lookup. The result is kept for a short interval and dropped
+        whenever this driver registers or evicts a cache file on the
+        share.
+        """
+        now = time.time()
+        with self._img_cache_lock:
+            cached = self._img_cache_index.get(share)
+            if cached is not None and cached[0] > now:
+                return cached[1]
+        image_ids = set()
+        try:
+            # Only the names are needed, so listdir works on every
+            # supported interpreter; scandir would buy nothing here.
+            for name in os.listdir(self._get_mount_point_for_share(share)):
+                if name.startswith('img-cache-'):
+                    image_ids.add(name[len('img-cache-'):])
+        except OSError as e:
+            LOG.debug('Cache scan of %(share)s failed: %(err)s',
+                      {'share': share, 'err': e})
+            return image_ids
+        with self._img_cache_lock:
+            self._img_cache_index[share] = (
+                now + IMAGE_CACHE_INDEX_TTL_SECONDS, image_ids)
+        return image_ids
+
+    def _invalidate_image_cache_index(self, share):
+        """Drops the cached image id listing for the given share."""
+        with self._img_cache_lock:
+            self._img_cache_index.pop(share, None)
+
     def _do_clone_rel_img_cache(self, src, dst, share, cache_file):
         """Do clone operation w.r.t image cache file."""
         @utils.synchronized(cache_file, external=True)
         def _do_clone():
             dir = self._get_mount_point_for_share(share)
-            file_path = '%s/%s' % (dir, dst)
+            file_path = os.path.join(dir, dst)
             if not os.path.exists(file_path):
                 LOG.info('Cloning from cache to destination %s', dst)
                 self._clone_backing_file_for_volume(src, dst, volume_id=None,
                                                     share=share)
-                src_path = '%s/%s' % (dir, src)
+                src_path = os.path.join(dir, src)
                 os.utime(src_path, None)
+                self._invalidate_image_cache_index(share)
         _do_clone()
 
-    @utils.synchronized('clean_cache')
     def _spawn_clean_cache_job(self):
         """Spawns a clean task if not running."""
-        if getattr(self, 'cleaning', None):
+        # A non-blocking try-acquire on a per-driver lock both tests and
+        # sets "cleaning in progress" in one step, so callers never queue
+        # up behind a process-wide named lock just to check a flag.
+        if not self._cleaning_lock.acquire(False):
             LOG.debug('Image cache cleaning in progress. Returning... ')
             return
-        else:
-            # Set cleaning to True
-            self.cleaning = True
+        try:
             t = threading.Timer(0, self._clean_image_cache)
             t.start()
+        except Exception:
+            self._cleaning_lock.release()
+            raise
 
     def _clean_image_cache(self):
         """Clean the image cache files in cache of space crunch."""
         try:
             LOG.debug('Image cache cleaning in progress.')
-            thres_size_perc_start =\
-                self.configuration.thres_avl_size_perc_start
-            thres_size_perc_stop = \
-                self.configuration.thres_avl_size_perc_stop
-            for share in getattr(self, '_mounted_shares', []):
-                try:
-                    total_size, total_avl = \
-                        self._get_capacity_info(share)
-                    avl_percent = int((float(total_avl) / total_size) * 100)
-                    if avl_percent <= thres_size_perc_start:
-                        LOG.info('Cleaning cache for share %s.', share)
-                        eligible_files = self._find_old_cache_files(share)
-                        threshold_size = int(
-                            (thres_size_perc_stop * total_size) / 100)
-                        bytes_to_free = int(threshold_size - total_avl)
-                        LOG.debug('Files to be queued for deletion %s',
-                                  eligible_files)
-                        self._delete_files_till_bytes_free(
-                            eligible_files, share, bytes_to_free)
-                    else:
-                        continue
-                except Exception as e:
-                    LOG.warning('Exception during cache cleaning'
-                                ' %(share)s. Message - %(ex)s',
-                                {'share': share, 'ex': e})
-                    continue
+            shares = list(getattr(self, '_mounted_shares', []))
+            if not shares:
+                return
+            # Shares are independent mounts, so clean them concurrently
+            # instead of paying each share's NFS latency in sequence. The
+            # cleaning lock still serializes whole runs of the cleaner.
+            num_workers = min(8, len(shares))
+            workers = []
+            for offset in range(num_workers):
+                worker = threading.Thread(
+                    target=self._clean_shares,
+                    args=(shares[offset::num_workers],))
+                worker.start()
+                workers.append(worker)
+            for worker in workers:
+                worker.join()
         finally:
             LOG.debug('Image cache cleaning done.')
-            self.cleaning = False
+            self._cleaning_lock.release()
+
+    def _clean_shares(self, shares):
+        """Cleans the image cache on each of the given shares."""
+        for share in shares:
+            self._clean_one_share(share)
+
+    def _clean_one_share(self, share):
+        """Cleans the image cache on a single share."""
+        thres_size_perc_start = self.configuration.thres_avl_size_perc_start
+        thres_size_perc_stop = self.configuration.thres_avl_size_perc_stop
+        try:
+            total_size, total_avl = self._get_capacity_info(share)
+            if not total_size:
+                return
+            # Integer arithmetic avoids the float round trip and keeps
+            # precision on very large shares.
+            avl_percent = total_avl * 100 // total_size
+            if avl_percent <= thres_size_perc_start:
+                LOG.info('Cleaning cache for share %s.', share)
+                eligible_files = self._find_old_cache_files(share)
+                threshold_size = thres_size_perc_stop * total_size // 100
+                bytes_to_free = int(threshold_size - total_avl)
+                LOG.debug('Files to be queued for deletion %s',
+                          eligible_files)
+                self._delete_files_till_bytes_free(
+                    eligible_files, share, bytes_to_free)
+                self._invalidate_image_cache_index(share)
+        except Exception as e:
+            LOG.warning('Exception during cache cleaning'
+                        ' %(share)s. Message - %(ex)s',
+                        {'share': share, 'ex': e})
 
     def _shortlist_del_eligible_files(self, share, old_files):
         """Prepares list of eligible files to be deleted from cache."""
@@ -469,6 +685,27 @@ class NetAppNfsDriver(driver.ManageableVD,
         """Finds the old files in cache."""
         mount_fs = self._get_mount_point_for_share(share)
         threshold_minutes = self.configuration.expiry_thres_minutes
+        cutoff = time.time() - threshold_minutes * 60
+        # Scan the mount in process instead of forking find; the same
+        # pass also collects the sizes the deletion budget needs, so no
+        # per-file round trip to the backend is required afterwards.
+        # os.scandir is Python 3.5+ (and only a context manager from
+        # 3.6), so older interpreters go straight to find.
+        if hasattr(os, 'scandir'):
+            try:
+                old_files = []
+                for entry in os.scandir(mount_fs):
+                    if (entry.name.startswith('img-cache') and
+                            entry.is_file(follow_symlinks=False)):
+                        entry_stat = entry.stat()
+                        if entry_stat.st_atime < cutoff:
+                            old_files.append((entry.name,
+                                              entry_stat.st_size))
+                return old_files
+            except OSError as e:
+                # Transient NFS errors (e.g. ESTALE) - fall back to find.
+                LOG.debug('Cache scan of %(share)s failed (%(err)s), falling'
+                          ' back to find.', {'share': share, 'err': e})
         cmd = ['find', mount_fs, '-maxdepth', '1', '-name',
                'img-cache*', '-amin', '+%s' % threshold_minutes]
         res, _err = self._execute(*cmd, run_as_root=self._execute_as_root)
@@ -484,31 +721,115 @@ class NetAppNfsDriver(driver.ManageableVD,
     def _delete_files_till_bytes_free(self, file_list, share, bytes_to_free=0):
         """Delete files from disk till bytes are freed or list exhausted."""
         LOG.debug('Bytes to free %s', bytes_to_free)
-        if file_list and bytes_to_free > 0:
-            sorted_files = sorted(file_list, key=lambda x: x[1], reverse=True)
-            mount_fs = self._get_mount_point_for_share(share)
-            for f in sorted_files:
-                if f:
-                    file_path = '%s/%s' % (mount_fs, f[0])
-                    LOG.debug('Delete file path %s', file_path)
-
-                    @utils.synchronized(f[0], external=True)
-                    def _do_delete():
-                        if self._delete_file_at_path(file_path):
-                            return True
-                        return False
-
-                    if _do_delete():
-                        bytes_to_free -= int(f[1])
-                        if bytes_to_free <= 0:
-                            return
+        if not file_list or bytes_to_free <= 0:
+            return
+        # Usually only a few of the candidates need to go to satisfy the
+        # byte budget, so pop the largest files off a max-heap instead of
+        # fully sorting the list, then remove each batch with a single rm
+        # invocation rather than one process per file.
+        heap = [(-int(f[1]), f[0]) for f in file_list if f]
+        heapq.heapify(heap)
+        mount_fs = self._get_mount_point_for_share(share)
+
+        # _do_clone_rel_img_cache holds an external lock named after the
+        # cache file while cloning from it, so deletion must take that
+        # same per-file lock to stay mutually exclusive with in-progress
+        # clones.  A non-blocking try-acquire keeps the batch moving: a
+        # busy file is being cloned from right now, so it is the worst
+        # possible eviction candidate anyway and simply stays cached
+        # until the next cleaning run.
+        def _do_delete(batch):
+            acquired = []
+            try:
+                to_delete = {}
+                for path, size in batch.items():
+                    lock = lockutils.external_lock(os.path.basename(path),
+                                                   'cinder-')
+                    if lock.acquire(blocking=False):
+                        acquired.append(lock)
+                        to_delete[path] = size
+                    else:
+                        LOG.debug('Skipping in-use cache file %s', path)
+                if not to_delete:
+                    return []
+                return self._delete_files_at_paths(to_delete)
+            finally:
+                for lock in acquired:
+                    lock.release()
+
+        while heap and bytes_to_free > 0:
+            batch = {}
+            budget = bytes_to_free
+            while heap and budget > 0:
+                neg_size, file_name = heapq.heappop(heap)
+                batch[os.path.join(mount_fs, file_name)] = -neg_size
+                budget += neg_size
+            LOG.debug('Files to be deleted %s', list(batch))
+            deleted = _do_delete(batch)
+            if not deleted:
+                return
+            bytes_to_free -= sum(batch[path] for path in deleted)
+
+    def _delete_files_at_paths(self, paths):
+        """Best-effort delete of many files with few rm invocations.
+
+        Returns the list of paths that were actually deleted.
+        """
+        try:
+            # Leave headroom under ARG_MAX for the environment and the
+            # rootwrap/sudo prefix.
+            argv_limit = os.sysconf('SC_ARG_MAX') - 100 * units.Ki
+        except (AttributeError, OSError, ValueError):
+            argv_limit = 100 * units.Ki
+        argv_limit = max(argv_limit, 4 * units.Ki)
+
+        deleted = []
+        chunk = []
+        chunk_len = 0
+        for path in paths:
+            if chunk and chunk_len + len(path) + 1 > argv_limit:
+                deleted.extend(self._delete_file_chunk(chunk))
+                chunk = []
+                chunk_len = 0
+            chunk.append(path)
+            chunk_len += len(path) + 1
+        if chunk:
+            deleted.extend(self._delete_file_chunk(chunk))
+        return deleted
+
+    def _delete_file_chunk(self, chunk):
+        """Delete a pre-sized list of files with one rm invocation."""
+        if not self._execute_as_root:
+            # No privilege boundary to cross, so skip the fork entirely
+            # and unlink in process.
+            return [path for path in chunk
+                    if self._delete_file_at_path(path)]
+        try:
+            self._execute('rm', '-f', *chunk,
+                          run_as_root=self._execute_as_root)
+            return chunk
+        except Exception as ex:
+            LOG.warning('Exception during batch delete %s', ex)
+            # Retry per file so one bad path does not abort the batch.
+            return [path for path in chunk
+                    if self._delete_file_at_path(path)]
 
     def _delete_file_at_path(self, path):
         """Delete file from disk and return result as boolean."""
+        LOG.debug('Deleting file at path %s', path)
+        try:
+            os.unlink(path)
+            return True
+        except OSError as ex:
+            if ex.errno == errno.ENOENT:
+                return True
+            if ex.errno not in (errno.EPERM, errno.EACCES):
+                LOG.warning('Exception during deleting %s', ex)
+                return False
+        # Only pay for a fork through rootwrap when the direct unlink is
+        # refused.
         try:
-            LOG.debug('Deleting file at path %s', path)
-            cmd = ['rm', '-f', path]
-            self._execute(*cmd, run_as_root=self._execute_as_root)
+            self._execute('rm', '-f', path, run_as_root=self._execute_as_root)
             return True
         except Exception as ex:
             LOG.warning('Exception during deleting %s', ex)
@@ -582,28 +903,51 @@ class NetAppNfsDriver(driver.ManageableVD,
         cloned = False
         image_locations = self._construct_image_nfs_url(image_location)
         run_as_root = self._execute_as_root
+
+        # Probe the cloneable locations whose shares show the most
+        # cached free space first, so the first compatibility check
+        # (a capacity query per probe) usually succeeds.
+        candidates = []
         for loc in image_locations:
             share = self._is_cloneable_share(loc)
-            if share and self._is_share_clone_compatible(volume, share):
+            if share:
+                candidates.append((loc, share))
+        candidates.sort(key=lambda entry: self._cached_free_bytes(entry[1]),
+                        reverse=True)
+
+        for loc, share in candidates:
+            if self._is_share_clone_compatible(volume, share):
                 LOG.debug('Share is cloneable %s', share)
                 volume['provider_location'] = share
                 (__, ___, img_file) = loc.rpartition('/')
                 dir_path = self._get_mount_point_for_share(share)
-                img_path = '%s/%s' % (dir_path, img_file)
-                img_info = image_utils.qemu_img_info(img_path,
-                                                     run_as_root=run_as_root)
-                if img_info.file_format == 'raw':
+                img_path = os.path.join(dir_path, img_file)
+                img_format = self._sniff_image_format(img_path)
+                if img_format is None:
+                    img_format = image_utils.qemu_img_info(
+                        img_path, run_as_root=run_as_root).file_format
+                if img_format == 'raw':
                     LOG.debug('Image is raw %s', image_id)
-                    self._clone_backing_file_for_volume(
-                        img_file, volume['name'],
-                        volume_id=None, share=share)
+                    try:
+                        self._clone_backing_file_for_volume(
+                            img_file, volume['name'],
+                            volume_id=None, share=share)
+                    except Exception:
+                        # The image lives on the same share, so a local
+                        # copy (offloaded to the server where the kernel
+                        # supports it) still beats re-downloading the
+                        # image from glance.
+                        LOG.debug('Clone failed, copying image %s locally.',
+                                  image_id)
+                        self._fast_local_copy(
+                            img_path, os.path.join(dir_path, volume['name']))
                     cloned = True
                     break
                 else:
                     LOG.info(
                         'Image will locally be converted to raw %s',
                         image_id)
-                    dst = '%s/%s' % (dir_path, volume['name'])
+                    dst = os.path.join(dir_path, volume['name'])
                     image_utils.convert_image(img_path, dst, 'raw',
                                               run_as_root=run_as_root)
                     data = image_utils.qemu_img_info(dst,
@@ -614,11 +958,49 @@ class NetAppNfsDriver(driver.ManageableVD,
                               " format is now %s") % data.file_format)
                     else:
                         cloned = True
-                        self._register_image_in_cache(
+                        self._spawn_image_cache_registration(
                             volume, image_id)
                         break
         return cloned
 
+    def _fast_local_copy(self, src, dst):
+        """Copies a raw file, offloading to the kernel when possible.
+
+        os.copy_file_range lets recent kernels turn the copy into a
+        server-side NFS COPY; anything without it falls back to a plain
+        buffered copy.
+        """
+        with open(src, 'rb') as src_file:
+            with open(dst, 'wb') as dst_file:
+                try:
+                    while os.copy_file_range(src_file.fileno(),
+                                             dst_file.fileno(),
+                                             64 * units.Mi):
+                        pass
+                except (AttributeError, OSError):
+                    src_file.seek(0)
+                    dst_file.seek(0)
+                    dst_file.truncate()
+                    shutil.copyfileobj(src_file, dst_file, 4 * units.Mi)
+
+    def _sniff_image_format(self, path):
+        """Guesses the image format from the file's magic bytes.
+
+        Saves the qemu-img subprocess on the common raw fast path; any
+        conversion still verifies its result with qemu-img afterwards.
+        Returns None when the file cannot be read, in which case the
+        caller should fall back to qemu-img info.
+        """
+        try:
+            with open(path, 'rb') as image_file:
+                header = image_file.read(16)
+        except (IOError, OSError):
+            return None
+        for magic, image_format in IMAGE_MAGICS:
+            if header.startswith(magic):
+                return image_format
+        return 'raw'
+
     def _post_clone_image(self, volume):
         """Do operations post image cloning."""
         LOG.info('Performing post clone for %s', volume['name'])
@@ -673,22 +1055,67 @@ class NetAppNfsDriver(driver.ManageableVD,
         # cache time before it refreshes directory information.
         # (See man 5 nfs acdirmax.)  Allow 75 seconds for
         # retries to ensure that this cache has refreshed.
-        retry_seconds = timeout
         sleep_interval = 2
         base_path = os.path.dirname(path)
         self._touch_path_to_refresh(base_path)
 
-        while True:
-            if os.path.exists(path):
-                return True
-            else:
-                if retry_seconds <= 0:
+        if os.path.exists(path):
+            return True
+
+        # The file is usually created server-side by the filer, which
+        # generates no inotify events on this client, so the periodic
+        # exists() probe (with a directory touch to force NFS attribute
+        # cache revalidation) remains the discovery mechanism.  An
+        # inotify watch, when available, only shortens the sleep slices
+        # by waking the loop as soon as a local process creates the
+        # file.
+        inotify_fd = self._inotify_watch(base_path)
+        try:
+            deadline = time.time() + timeout
+            while True:
+                if os.path.exists(path):
+                    return True
+                remaining = deadline - time.time()
+                if remaining <= 0:
                     LOG.warning('Discover file retries exhausted.')
                     return False
+                wait = min(sleep_interval, remaining)
+                if inotify_fd is None:
+                    time.sleep(wait)
                 else:
-                    time.sleep(sleep_interval)
-                    retry_seconds -= sleep_interval
-                    self._touch_path_to_refresh(base_path)
+                    rlist, _w, _x = select.select(
+                        [inotify_fd], [], [], wait)
+                    if rlist:
+                        # Drain the queued events; the exists() probe
+                        # above is simpler than decoding the event
+                        # records for the name.
+                        os.read(inotify_fd, 4096)
+                self._touch_path_to_refresh(base_path)
+        finally:
+            if inotify_fd is not None:
+                os.close(inotify_fd)
+
+    @staticmethod
+    def _inotify_watch(directory):
+        """Returns an inotify fd watching directory, or None.
+
+        The watch is strictly an optimization, so any failure to
+        establish one (including platforms without inotify) yields None
+        and the caller falls back to plain sleeps.
+        """
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK)
+            if fd < 0:
+                return None
+            mask = IN_CREATE | IN_MOVED_TO | IN_CLOSE_WRITE
+            wd = libc.inotify_add_watch(fd, directory.encode(), mask)
+            if wd < 0:
+                os.close(fd)
+                return None
+            return fd
+        except (AttributeError, OSError):
+            return None
 
     def _is_cloneable_share(self, image_location):
         """Finds if the image at location is cloneable."""
@@ -705,10 +1132,7 @@ class NetAppNfsDriver(driver.ManageableVD,
         """
         conn, dr = None, None
         if image_location:
-            nfs_loc_pattern = \
-                (r'^nfs://(([\w\-\.]+:{1}[\d]+|[\w\-\.]+)(/[^\/].*)'
-                 r'*(/[^\/\\\\]+)$)')
-            matched = re.match(nfs_loc_pattern, image_location, flags=0)
+            matched = NFS_LOC_PATTERN.match(image_location)
             if not matched:
                 LOG.debug('Image location not in the'
                           ' expected format %s', image_location)
@@ -726,17 +1150,75 @@ class NetAppNfsDriver(driver.ManageableVD,
         """
         raise NotImplementedError()
 
+    def _resolve_hostname(self, hostname):
+        """Resolves a hostname, keeping the answer for a few minutes.
+
+        The manage and clone paths resolve the same share hosts over and
+        over; a short TTL keeps those lookups out of DNS without pinning
+        stale addresses for long.
+        """
+        now = time.time()
+        entry = self._hostname_cache.get(hostname)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        address = na_utils.resolve_hostname(hostname)
+        self._hostname_cache[hostname] = (
+            now + HOSTNAME_TTL_SECONDS, address)
+        return address
+
+    def _shares_by_export_path(self):
+        """Returns a mapping of export path to mounted share strings.
+
+        The index is rebuilt whenever the mounted share list changes, so
+        lookups stay a dict hit instead of a scan-and-split over every
+        share per call.
+        """
+        shares = tuple(getattr(self, '_mounted_shares', None) or ())
+        cached = self._share_index
+        if cached is not None and cached[0] == shares:
+            return cached[1]
+        index = collections.defaultdict(list)
+        for sh in shares:
+            index[sh.rpartition(':')[2]].append(sh)
+        self._share_index = (shares, dict(index))
+        return self._share_index[1]
+
+    def _mounted_shares_in_ip_form(self):
+        """Returns (share, ip-form share) pairs for the mounted shares.
+
+        Rebuilt only when the mounted share list changes, so the manage
+        candidate loop compares against precomputed IP forms instead of
+        re-splitting and re-resolving every share per request.
+        """
+        shares = tuple(getattr(self, '_mounted_shares', None) or ())
+        cached = self._share_ip_index
+        if cached is not None and cached[0] == shares:
+            return cached[1]
+        pairs = [
+            (share, self._convert_vol_ref_share_name_to_share_ip(share))
+            for share in shares]
+        self._share_ip_index = (shares, pairs)
+        return pairs
+
+    def _mounted_shares_set(self):
+        """Set of the mounted shares, for exact-match membership tests.
+
+        Rebuilt only when the mounted share list changes.
+        """
+        shares = tuple(getattr(self, '_mounted_shares', None) or ())
+        cached = self._share_set
+        if cached is not None and cached[0] == shares:
+            return cached[1]
+        self._share_set = (shares, frozenset(shares))
+        return self._share_set[1]
+
     def _check_share_in_use(self, conn, dir):
         """Checks if share is cinder mounted and returns it."""
         try:
             if conn:
-                host = conn.split(':')[0]
-                ip = na_utils.resolve_hostname(host)
-                share_candidates = []
-                for sh in self._mounted_shares:
-                    sh_exp = sh.split(':')[1]
-                    if sh_exp == dir:
-                        share_candidates.append(sh)
+                host = conn.partition(':')[0]
+                ip = self._resolve_hostname(host)
+                share_candidates = self._shares_by_export_path().get(dir)
                 if share_candidates:
                     LOG.debug('Found possible share matches %s',
                               share_candidates)
@@ -776,8 +1258,20 @@ class NetAppNfsDriver(driver.ManageableVD,
                     continue
                 url = location['url']
                 url_parse = urllib.parse.urlparse(url)
-                abs_path = os.path.join(url_parse.netloc, url_parse.path)
-                rel_path = os.path.relpath(abs_path, mountpoint)
+                # The path of a file:// or nfs:// URL is absolute, so
+                # joining it onto the netloc would discard the netloc
+                # anyway.
+                abs_path = url_parse.path or url_parse.netloc
+                # Match on a path boundary so mountpoint /mnt/a is not
+                # mistaken for a prefix of /mnt/ab/img.
+                mountpoint_prefix = mountpoint.rstrip('/') + '/'
+                if abs_path.startswith(mountpoint_prefix):
+                    # Both paths are absolute, so the relative path is a
+                    # simple prefix strip; os.path.relpath would stat the
+                    # working directory and normalize both operands.
+                    rel_path = abs_path[len(mountpoint_prefix):]
+                else:
+                    rel_path = os.path.relpath(abs_path, mountpoint)
                 direct_url = "%s/%s" % (share_location, rel_path)
                 urls.append(direct_url)
         return urls
@@ -790,26 +1284,36 @@ class NetAppNfsDriver(driver.ManageableVD,
         try:
             path = self.local_path(volume)
             self._resize_image_file(path, new_size)
+            if volume.get('provider_location'):
+                self._invalidate_capacity_cache(volume['provider_location'])
         except Exception as err:
             exception_msg = (_("Failed to extend volume "
                                "%(name)s, Error msg: %(msg)s.") %
                              {'name': volume['name'],
-                              'msg': six.text_type(err)})
+                              'msg': err})
             raise exception.VolumeBackendAPIException(data=exception_msg)
 
         try:
             extra_specs = na_utils.get_volume_extra_specs(volume)
 
-            # Create volume copy with new size for size-dependent QOS specs
-            volume_copy = copy.copy(volume)
-            volume_copy['size'] = new_size
+            # Create a lightweight volume copy with the new size for the
+            # size-dependent QOS specs.  Copying the volume object walks
+            # every field and can trip lazy loaders; the QoS path only
+            # reads these scalar fields.
+            volume_copy = {
+                'id': volume['id'],
+                'name': volume['name'],
+                'host': volume['host'],
+                'volume_type_id': volume.get('volume_type_id'),
+                'size': new_size,
+            }
 
             self._do_qos_for_volume(volume_copy, extra_specs, cleanup=False)
         except Exception as err:
             exception_msg = (_("Failed to set QoS for existing volume "
                                "%(name)s, Error msg: %(msg)s.") %
                              {'name': volume['name'],
-                              'msg': six.text_type(err)})
+                              'msg': err})
             raise exception.VolumeBackendAPIException(data=exception_msg)
 
     def _is_share_clone_compatible(self, volume, share):
@@ -841,6 +1345,31 @@ class NetAppNfsDriver(driver.ManageableVD,
     def _move_nfs_file(self, source_path, dest_path):
         """Moves source to destination."""
 
+        # Both paths live on the same export, so link() is a single NFS
+        # RPC and fails atomically with EEXIST if the destination
+        # already exists.  That makes the external file lock and the
+        # mv subprocess unnecessary on the common path.
+        try:
+            os.link(source_path, dest_path)
+        except OSError as e:
+            if e.errno == errno.EEXIST:
+                LOG.warning("Destination %s already exists.", dest_path)
+                return False
+            return self._move_nfs_file_fallback(source_path, dest_path)
+
+        try:
+            os.unlink(source_path)
+        except OSError as e:
+            LOG.warning('Exception removing file %(src)s after moving it '
+                        'to %(dst)s. Message - %(e)s',
+                        {'src': source_path, 'dst': dest_path, 'e': e})
+        return True
+
+    def _move_nfs_file_fallback(self, source_path, dest_path):
+        """Moves source to destination with a locked mv subprocess."""
+
+        # Unlike link(), mv plus an exists() pre-check is not atomic, so
+        # this rarely-taken path still serializes on the destination.
         @utils.synchronized(dest_path, external=True)
         def _move_file(src, dst):
             if os.path.exists(dst):
@@ -856,6 +1385,43 @@ class NetAppNfsDriver(driver.ManageableVD,
                         {'src': source_path, 'e': e})
         return False
 
+    @staticmethod
+    def _run_in_parallel(tasks, max_workers=8):
+        """Runs zero-argument callables across worker threads.
+
+        The callables are latency-bound filer RPCs, so overlapping them
+        collapses N round trips into roughly the longest one.  All tasks
+        run to completion; the first exception any of them raised is
+        re-raised afterwards.
+        """
+        if not tasks:
+            return
+        if len(tasks) == 1:
+            tasks[0]()
+            return
+
+        errors = []
+
+        def _worker(task_slice):
+            for task in task_slice:
+                try:
+                    task()
+                except Exception:
+                    errors.append(sys.exc_info())
+
+        num_workers = min(max_workers, len(tasks))
+        workers = []
+        for offset in range(num_workers):
+            worker = threading.Thread(target=_worker,
+                                      args=(tasks[offset::num_workers],))
+            worker.start()
+            workers.append(worker)
+        for worker in workers:
+            worker.join()
+
+        if errors:
+            six.reraise(*errors[0])
+
     def _get_export_ip_path(self, volume_id=None, share=None):
         """Returns export ip and path.
 
@@ -863,11 +1429,11 @@ class NetAppNfsDriver(driver.ManageableVD,
         """
 
         if volume_id:
-            host_ip = self._get_host_ip(volume_id)
-            export_path = self._get_export_path(volume_id)
+            # One location fetch and one split cover both halves.
+            host_ip, export_path = self._split_provider_location(
+                self._get_provider_location(volume_id))
         elif share:
-            host_ip = share.split(':')[0]
-            export_path = share.split(':')[1]
+            host_ip, export_path = self._split_provider_location(share)
         else:
             raise exception.InvalidInput(
                 'A volume ID or share was not specified.')
@@ -890,11 +1456,39 @@ class NetAppNfsDriver(driver.ManageableVD,
 
     def _get_capacity_info(self, nfs_share):
         """Get total capacity and free capacity in bytes for an nfs share."""
-        export_path = nfs_share.rsplit(':', 1)[1]
-        capacity = self.zapi_client.get_flexvol_capacity(
-            flexvol_path=export_path)
+        export_path = nfs_share.rpartition(':')[2]
+        entry = self._capacity_cache.get(export_path)
+        if entry is not None and time.time() < entry[0]:
+            capacity = entry[1]
+        else:
+            capacity = self.zapi_client.get_flexvol_capacity(
+                flexvol_path=export_path)
+            self._capacity_cache[export_path] = (
+                time.time() + CAPACITY_TTL_SECONDS, capacity)
         return capacity['size-total'], capacity['size-available']
 
+    def _prime_capacity_cache(self, capacities):
+        """Seeds the capacity cache from a bulk capacity query."""
+        expiry = time.time() + CAPACITY_TTL_SECONDS
+        self._capacity_cache = dict(
+            (export_path, (expiry, capacity))
+            for export_path, capacity in capacities.items())
+
+    def _invalidate_capacity_cache(self, nfs_share):
+        """Forgets cached capacity after an operation that changes it."""
+        self._capacity_cache.pop(nfs_share.rpartition(':')[2], None)
+
+    def _cached_free_bytes(self, nfs_share):
+        """Best-effort cached free space for a share, for ordering only.
+
+        Returns zero for shares without a live cache entry; callers use
+        this to order candidates, not to make placement decisions.
+        """
+        entry = self._capacity_cache.get(nfs_share.rpartition(':')[2])
+        if entry is not None and time.time() < entry[0]:
+            return entry[1]['size-available']
+        return 0
+
     def _check_volume_type(self, volume, share, file_name, extra_specs):
         """Match volume type for share file."""
 
@@ -910,7 +1504,7 @@ class NetAppNfsDriver(driver.ManageableVD,
         # First strip out share and convert to IP format.
         share_split = vol_ref.rsplit(':', 1)
 
-        vol_ref_share_ip = na_utils.resolve_hostname(share_split[0])
+        vol_ref_share_ip = self._resolve_hostname(share_split[0])
 
         # Now place back into volume reference.
         vol_ref_share = vol_ref_share_ip + ':' + share_split[1]
@@ -925,7 +1519,8 @@ class NetAppNfsDriver(driver.ManageableVD,
         if unsuccessful.
 
         :param vol_ref: Driver-specific information used to identify a volume
-        :return:        NFS Share, NFS mount, volume path or raise error
+        :return:        NFS Share, NFS mount, volume path, stat result or
+                        raise error
         """
         # Check that the reference is valid.
         if 'source-name' not in vol_ref:
@@ -936,6 +1531,24 @@ class NetAppNfsDriver(driver.ManageableVD,
 
         self._ensure_shares_mounted()
 
+        # Fast path: when the reference names the share exactly as it
+        # appears in the share config, skip host name resolution and the
+        # candidate scan entirely.
+        share_part, _sep, file_part = vol_ref_name.rpartition('/')
+        if file_part and share_part in self._mounted_shares_set():
+            nfs_mount = self._get_mount_point_for_share(share_part)
+            vol_full_path = os.path.join(nfs_mount, file_part)
+            try:
+                vol_stat = os.stat(vol_full_path)
+            except OSError:
+                vol_stat = None
+            if vol_stat is not None and stat.S_ISREG(vol_stat.st_mode):
+                LOG.debug("Found share %(share)s and vol %(path)s on "
+                          "mount %(mnt)s",
+                          {'share': share_part, 'path': file_part,
+                           'mnt': nfs_mount})
+                return share_part, nfs_mount, file_part, vol_stat
+
         # If a share was declared as '1.2.3.4:/a/b/c' in the nfs_shares_config
         # file, but the admin tries to manage the file located at
         # 'my.hostname.com:/a/b/c/d.vol', this might cause a lookup miss below
@@ -944,8 +1557,7 @@ class NetAppNfsDriver(driver.ManageableVD,
         # comparison is done instead of IP comparison).
         vol_ref_share = self._convert_vol_ref_share_name_to_share_ip(
             vol_ref_name)
-        for nfs_share in self._mounted_shares:
-            cfg_share = self._convert_vol_ref_share_name_to_share_ip(nfs_share)
+        for nfs_share, cfg_share in self._mounted_shares_in_ip_form():
             (orig_share, work_share, file_path) = \
                 vol_ref_share.partition(cfg_share)
             if work_share == cfg_share:
@@ -954,12 +1566,20 @@ class NetAppNfsDriver(driver.ManageableVD,
                           work_share)
                 nfs_mount = self._get_mount_point_for_share(nfs_share)
                 vol_full_path = os.path.join(nfs_mount, file_path)
-                if os.path.isfile(vol_full_path):
+                # A single stat per matching share answers both existence
+                # and file type; each probe is an NFS round trip.
+                try:
+                    vol_stat = os.stat(vol_full_path)
+                except OSError:
+                    vol_stat = None
+                if vol_stat is not None and stat.S_ISREG(vol_stat.st_mode):
                     LOG.debug("Found share %(share)s and vol %(path)s on "
                               "mount %(mnt)s",
                               {'share': nfs_share, 'path': file_path,
                                'mnt': nfs_mount})
-                    return nfs_share, nfs_mount, file_path
+                    # Hand the stat result back too, so callers that
+                    # need the file size do not stat the file again.
+                    return nfs_share, nfs_mount, file_path, vol_stat
             else:
                 LOG.debug("vol_ref %(ref)s not on share %(share)s.",
                           {'ref': vol_ref_share, 'share': nfs_share})
@@ -983,7 +1603,7 @@ class NetAppNfsDriver(driver.ManageableVD,
                                  volume
         """
         # Attempt to find NFS share, NFS mount, and volume path from vol_ref.
-        (nfs_share, nfs_mount, vol_path) = \
+        (nfs_share, nfs_mount, vol_path, _vol_stat) = \
             self._get_share_mount_and_vol_from_vol_ref(existing_vol_ref)
 
         LOG.debug("Asked to manage NFS volume %(vol)s, with vol ref %(ref)s",
@@ -1001,7 +1621,10 @@ class NetAppNfsDriver(driver.ManageableVD,
             src_vol = os.path.join(nfs_mount, vol_path)
             dst_vol = os.path.join(nfs_mount, volume['name'])
             try:
-                shutil.move(src_vol, dst_vol)
+                # Source and destination are on the same mount, so a
+                # bare rename works and skips shutil.move's stat calls
+                # and copy fallback.
+                os.rename(src_vol, dst_vol)
                 LOG.debug("Setting newly managed Cinder volume name to %s",
                           volume['name'])
                 self._set_rw_permissions_for_all(dst_vol)
@@ -1018,7 +1641,7 @@ class NetAppNfsDriver(driver.ManageableVD,
             exception_msg = (_("Failed to set QoS for existing volume "
                                "%(name)s, Error msg: %(msg)s.") %
                              {'name': existing_vol_ref['source-name'],
-                              'msg': six.text_type(err)})
+                              'msg': err})
             raise exception.VolumeBackendAPIException(data=exception_msg)
 
         model_update = self._get_volume_model_update(volume) or {}
@@ -1035,16 +1658,18 @@ class NetAppNfsDriver(driver.ManageableVD,
         :param existing_vol_ref: Existing volume to take under management
         """
         # Attempt to find NFS share, NFS mount, and volume path from vol_ref.
-        (nfs_share, nfs_mount, vol_path) = \
+        (_nfs_share, _nfs_mount, _vol_path, vol_stat) = \
             self._get_share_mount_and_vol_from_vol_ref(existing_vol_ref)
 
         try:
             LOG.debug("Asked to get size of NFS vol_ref %s.",
                       existing_vol_ref['source-name'])
 
-            file_path = os.path.join(nfs_mount, vol_path)
-            file_size = float(utils.get_file_size(file_path)) / units.Gi
-            vol_size = int(math.ceil(file_size))
+            # The lookup above already stat'd the file, so reuse that
+            # answer instead of paying another GETATTR round trip.  The
+            # round-up is done in integer math; float division can give
+            # a wrong GB count for very large files.
+            vol_size = (int(vol_stat.st_size) + units.Gi - 1) // units.Gi
         except (OSError, ValueError):
             exception_message = (_("Failed to manage existing volume "
                                    "%(name)s, because of error in getting "
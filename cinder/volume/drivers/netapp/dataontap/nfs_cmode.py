@@ -21,6 +21,7 @@
 Volume driver for NetApp NFS storage.
 """
 
+import functools
 import os
 import uuid
 
@@ -185,7 +186,7 @@ class NetAppCmodeNfsDriver(nfs_base.NetAppNfsDriver,
             return
         target_path = '%s' % (volume['name'])
         share = volume_utils.extract_host(volume['host'], level='pool')
-        export_path = share.split(':')[1]
+        export_path = share.rpartition(':')[2]
         flex_vol_name = self.zapi_client.get_vol_by_junc_vserver(self.vserver,
                                                                  export_path)
         self.zapi_client.file_assign_qos(flex_vol_name,
@@ -253,6 +254,11 @@ class NetAppCmodeNfsDriver(nfs_base.NetAppNfsDriver,
         aggregates = self.ssc_library.get_ssc_aggregates()
         aggr_capacities = self.zapi_client.get_aggregate_capacities(aggregates)
 
+        # Get up-to-date flexvol capacities just once and let
+        # _get_capacity_info serve the pool loop from them instead of
+        # querying the capacity of each flexvol separately.
+        self._prime_capacity_cache(self.zapi_client.get_flexvol_capacities())
+
         for ssc_vol_name, ssc_vol_info in ssc.items():
 
             pool = dict()
@@ -314,8 +320,7 @@ class NetAppCmodeNfsDriver(nfs_base.NetAppNfsDriver,
 
         for share in self._mounted_shares:
 
-            host = share.split(':')[0]
-            junction_path = share.split(':')[1]
+            host, junction_path = self._split_provider_location(share)
             address = na_utils.resolve_hostname(host)
 
             if address not in vserver_addresses:
@@ -353,7 +358,7 @@ class NetAppCmodeNfsDriver(nfs_base.NetAppNfsDriver,
         ip_vserver = self._get_vserver_for_ip(ip)
         if ip_vserver and shares:
             for share in shares:
-                ip_sh = share.split(':')[0]
+                ip_sh = share.partition(':')[0]
                 sh_vserver = self._get_vserver_for_ip(ip_sh)
                 if sh_vserver == ip_vserver:
                     LOG.debug('Share match found for ip %s', ip)
@@ -436,6 +441,7 @@ class NetAppCmodeNfsDriver(nfs_base.NetAppNfsDriver,
         LOG.debug('Attempting to delete file %(path)s for ID %(file_id)s on '
                   'backend.', {'path': path_on_backend, 'file_id': file_id})
         self.zapi_client.delete_file(path_on_backend)
+        self._invalidate_capacity_cache(flexvol)
 
     @utils.trace_method
     def delete_snapshot(self, snapshot):
@@ -570,8 +576,9 @@ class NetAppCmodeNfsDriver(nfs_base.NetAppNfsDriver,
                   volume['id'])
 
     def _get_source_ip_and_path(self, nfs_share, file_name):
-        src_ip = self._get_ip_verify_on_cluster(nfs_share.split(':')[0])
-        src_path = os.path.join(nfs_share.split(':')[1], file_name)
+        src_host, src_export_path = self._split_provider_location(nfs_share)
+        src_ip = self._get_ip_verify_on_cluster(src_host)
+        src_path = os.path.join(src_export_path, file_name)
         return src_ip, src_path
 
     def _get_destination_ip_and_path(self, volume):
@@ -601,7 +608,8 @@ class NetAppCmodeNfsDriver(nfs_base.NetAppNfsDriver,
             conn, dr = self._check_get_nfs_path_segs(location)
             if conn:
                 try:
-                    src_ip = self._get_ip_verify_on_cluster(conn.split(':')[0])
+                    src_ip = self._get_ip_verify_on_cluster(
+                        conn.partition(':')[0])
                     selected_loc = location
                     break
                 except exception.NotFound:
@@ -613,7 +621,7 @@ class NetAppCmodeNfsDriver(nfs_base.NetAppNfsDriver,
         dst_ip = self._get_ip_verify_on_cluster(self._get_host_ip(
             volume['id']))
         # tmp file is required to deal with img formats
-        tmp_img_file = six.text_type(uuid.uuid4())
+        tmp_img_file = str(uuid.uuid4())
         col_path = self.configuration.netapp_copyoffload_tool_path
         img_info = image_service.show(context, image_id)
         dst_share = self._get_provider_location(volume['id'])
@@ -650,7 +658,7 @@ class NetAppCmodeNfsDriver(nfs_base.NetAppNfsDriver,
                           {'img': image_id, 'vol': volume['id']})
             else:
                 LOG.debug('Image will be converted to raw %s.', image_id)
-                img_conv = six.text_type(uuid.uuid4())
+                img_conv = str(uuid.uuid4())
                 dst_img_conv_local = os.path.join(dst_dir, img_conv)
 
                 # Checking against image size which is approximate check
@@ -761,18 +769,25 @@ class NetAppCmodeNfsDriver(nfs_base.NetAppNfsDriver,
                  that were deleted.
         """
         model_update = {'status': fields.GroupStatus.DELETED}
-        volumes_model_update = []
-        for volume in volumes:
+        volumes_model_update = [None] * len(volumes)
+
+        # Each delete is a latency-bound unlink on the filer, so issue
+        # them in parallel; per-volume failures only mark that volume.
+        def _delete_volume(index, volume):
             try:
                 self._delete_file(volume['id'], volume['name'])
-                volumes_model_update.append(
+                volumes_model_update[index] = (
                     {'id': volume['id'], 'status': 'deleted'})
             except Exception:
-                volumes_model_update.append(
+                volumes_model_update[index] = (
                     {'id': volume['id'],
                      'status': fields.GroupStatus.ERROR_DELETING})
                 LOG.exception("Volume %(vol)s in the group could not be "
                               "deleted.", {'vol': volume})
+
+        self._run_in_parallel([
+            functools.partial(_delete_volume, index, volume)
+            for index, volume in enumerate(volumes)])
         return model_update, volumes_model_update
 
     @utils.trace_method
@@ -830,14 +845,19 @@ class NetAppCmodeNfsDriver(nfs_base.NetAppNfsDriver,
         # Create snapshot for backing flexvol
         self.zapi_client.create_cg_snapshot(flexvols, group_snapshot['id'])
 
-        # Start clone process for snapshot files
-        for snapshot in snapshots:
-            self._clone_backing_file_for_volume(
+        # Start clone process for snapshot files.  The clones are
+        # independent filer calls, so issue them in parallel.
+        self._run_in_parallel([
+            functools.partial(
+                self._clone_backing_file_for_volume,
                 snapshot['volume']['name'], snapshot['name'],
-                snapshot['volume']['id'], source_snapshot=group_snapshot['id'])
+                snapshot['volume']['id'],
+                source_snapshot=group_snapshot['id'])
+            for snapshot in snapshots])
 
-        # Delete backing flexvol snapshots
-        for flexvol_name in flexvols:
+        # Delete backing flexvol snapshots.  Waiting out busy snapshots
+        # in parallel overlaps the per-flexvol retry sleeps.
+        def _delete_flexvol_snapshot(flexvol_name):
             try:
                 self.zapi_client.wait_for_busy_snapshot(
                     flexvol_name, group_snapshot['id'])
@@ -846,6 +866,11 @@ class NetAppCmodeNfsDriver(nfs_base.NetAppNfsDriver,
             except exception.SnapshotIsBusy:
                 self.zapi_client.mark_snapshot_for_deletion(
                     flexvol_name, group_snapshot['id'])
+                self._mark_snapshot_cleanup_needed()
+
+        self._run_in_parallel([
+            functools.partial(_delete_flexvol_snapshot, flexvol_name)
+            for flexvol_name in flexvols])
 
     @utils.trace_method
     def create_group_from_src(self, context, group, volumes,
@@ -877,12 +902,16 @@ class NetAppCmodeNfsDriver(nfs_base.NetAppNfsDriver,
             snapshot_name = 'snapshot-temp-' + source_group['id']
             self.zapi_client.create_cg_snapshot(flexvols, snapshot_name)
 
-            # Start clone process for new volumes
-            vols = zip(volumes, sorted_source_vols)
-            for volume, source_vol in vols:
-                self._clone_backing_file_for_volume(
+            # Start clone process for new volumes in parallel, then
+            # collect the model updates in the original volume order.
+            vols = list(zip(volumes, sorted_source_vols))
+            self._run_in_parallel([
+                functools.partial(
+                    self._clone_backing_file_for_volume,
                     source_vol['name'], volume['name'],
                     source_vol['id'], source_snapshot=snapshot_name)
+                for volume, source_vol in vols])
+            for volume, source_vol in vols:
                 volume_model_update = (
                     self._get_volume_model_update(volume) or {})
                 volume_model_update.update({
@@ -892,10 +921,14 @@ class NetAppCmodeNfsDriver(nfs_base.NetAppNfsDriver,
                 volumes_model_update.append(volume_model_update)
 
             # Delete backing flexvol snapshots
-            for flexvol_name in flexvols:
+            def _delete_flexvol_snapshot(flexvol_name):
                 self.zapi_client.wait_for_busy_snapshot(
                     flexvol_name, snapshot_name)
                 self.zapi_client.delete_snapshot(flexvol_name, snapshot_name)
+
+            self._run_in_parallel([
+                functools.partial(_delete_flexvol_snapshot, flexvol_name)
+                for flexvol_name in flexvols])
         else:
             LOG.error("Unexpected set of parameters received when "
                       "creating group from source.")
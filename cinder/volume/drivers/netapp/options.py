@@ -165,7 +165,16 @@ netapp_nfs_extra_opts = [
                help=('This option specifies the path of the NetApp copy '
                      'offload tool binary. Ensure that the binary has execute '
                      'permissions set which allow the effective user of the '
-                     'cinder-volume process to execute the file.')), ]
+                     'cinder-volume process to execute the file.')),
+    cfg.BoolOpt('netapp_use_fsc',
+                default=False,
+                help=('This option determines if NFS shares are mounted '
+                      'with the fsc option so that reads are cached on '
+                      'local disk by the kernel FS-Cache facility. '
+                      'Read-heavy workloads, such as cloning volumes from '
+                      'frequently used Glance images, benefit the most. '
+                      'The host must have cachefilesd running for the '
+                      'option to take effect.')), ]
 netapp_san_opts = [
     cfg.StrOpt('netapp_lun_ostype',
                help=('This option defines the type of operating system that'